@@ -0,0 +1,156 @@
+import argparse
+import io
+import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import copy
+from statistics import mean, median
+from timeit import default_timer
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from genart.parse import parse_seeds
+
+log = logging.getLogger(__name__)
+
+
+class BatchItem(NamedTuple):
+    seed: int
+    seconds: float
+    error: Optional[str] = None
+
+
+def register_parser(subparsers):
+    parser = subparsers.add_parser(
+        "batch",
+        help="Render a subcommand for many seeds",
+        description=(
+            "Runs a subcommand once per seed, on a pool of processes. "
+            "Outputs are named after their seed, so reruns overwrite them. "
+            "Standard input is read once and passed to every run. "
+            "Batch options can also follow the subcommand: --seeds always, and "
+            "-j/--jobs/--workers unless the subcommand has an option of that name."
+        ),
+        # Never mistake the subcommand's options for abbreviations of ours:
+        allow_abbrev=False,
+    )
+    _add_batch_options(parser)
+    parser.add_argument(
+        "command", nargs=argparse.REMAINDER, help="The subcommand and its arguments"
+    )
+
+    parser.set_defaults(func=main)
+
+
+def _add_batch_options(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--seeds", type=parse_seeds, help="E.g. 7, 0..999 or 1,5,10..20"
+    )
+    parser.add_argument(
+        "-j", "--jobs", "--workers", type=int, help="Defaults to the CPU count"
+    )
+
+
+def main(args, config):
+    usage = "usage: genart batch <subcommand> --seeds SEEDS [--workers N] [...]"
+    if not args.command:
+        raise SystemExit(usage)
+
+    sub_args, options = parse_command(args.command)
+    seeds = options.seeds or args.seeds
+    jobs = options.jobs or args.jobs
+    if not seeds:
+        raise SystemExit(usage)
+    if not hasattr(sub_args, "seed"):
+        raise SystemExit(f"{args.command[0]} has no --seed to vary")
+
+    stdin = None if sys.stdin.isatty() else sys.stdin.read()
+    key_width = len(str(max(seeds)))
+
+    items = []
+    start = default_timer()
+    with ProcessPoolExecutor(jobs) as pool:
+        futures = [
+            pool.submit(
+                _render,
+                sub_args,
+                {**config, "output_key": f"seed{seed:0{key_width}d}"},
+                seed,
+                stdin,
+            )
+            for seed in seeds
+        ]
+        for future in as_completed(futures):
+            item = future.result()
+            items.append(item)
+            status = f"failed: {item.error}" if item.error else "done"
+            log.info(
+                "[%d/%d] seed %d %s in %.2fs",
+                len(items),
+                len(futures),
+                item.seed,
+                status,
+                item.seconds,
+            )
+
+    print(summary(items, default_timer() - start))
+    if any(item.error for item in items):
+        sys.exit(1)
+
+
+def parse_command(
+    command: List[str],
+) -> Tuple[argparse.Namespace, argparse.Namespace]:
+    """
+    The arguments of the subcommand line `command`, and the batch options in it
+    that the subcommand doesn't know itself.
+    """
+    from genart.main import build_parser
+
+    parser = build_parser(command)
+    sub_args, rest = parser.parse_known_args(command)
+
+    options = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    _add_batch_options(options)
+    batch_args, unknown = options.parse_known_args(rest)
+    if unknown:
+        parser.error(f"unrecognized arguments: {' '.join(unknown)}")
+
+    return sub_args, batch_args
+
+
+def _render(
+    args: argparse.Namespace, config: Dict[str, Any], seed: int, stdin: Optional[str]
+) -> BatchItem:
+    args = copy(args)
+    args.seed = seed
+    if stdin is not None:
+        sys.stdin = io.StringIO(stdin)
+
+    start = default_timer()
+    try:
+        args.func(args, config)
+    except Exception as e:
+        return BatchItem(seed, default_timer() - start, f"{type(e).__name__}: {e}")
+    return BatchItem(seed, default_timer() - start)
+
+
+def summary(items: List[BatchItem], wall_time: float) -> str:
+    """A report of the number of runs, failures and their timings"""
+    times = sorted(item.seconds for item in items)
+    failed = sorted(item.seed for item in items if item.error)
+    lines = [
+        f"{len(items)} runs, {len(failed)} failed, in {wall_time:.2f}s "
+        f"({len(items) / wall_time if wall_time else 0.0:.2f} runs/s)"
+    ]
+    if times:
+        lines.append(
+            f"per run: min {times[0]:.2f}s, median {median(times):.2f}s, "
+            f"mean {mean(times):.2f}s, max {times[-1]:.2f}s"
+        )
+        slowest = sorted(items, key=lambda item: item.seconds, reverse=True)[:5]
+        seeds = ", ".join(f"{item.seed} ({item.seconds:.2f}s)" for item in slowest)
+        lines.append(f"slowest seeds: {seeds}")
+    if failed:
+        lines.append(f"failed seeds: {', '.join(map(str, failed))}")
+
+    return "\n".join(lines)
@@ -1,11 +1,12 @@
-import datetime as dt
 import logging
 
 import cairo
 from numpy.random import default_rng
 
 from genart.fps import FPSCounter
+from genart.output import output_file
 from genart.parse import parse_size
+from genart.simplify import Simplification
 
 from .generator import generate_particles, make_chamber
 from .render import BubbleChamberRenderer, ColorScheme, LineWidth
@@ -24,6 +25,17 @@ def register_parser(subparsers):
     parser.add_argument("-c", "--colorscheme", type=ColorScheme, default=ColorScheme.BW)
     parser.add_argument("-l", "--linewidth", type=LineWidth, default=LineWidth.CONSTANT)
     parser.add_argument("--allow-3d", action="store_true")
+    parser.add_argument(
+        "--stream", action="store_true", help="Draw trails as soon as they're done"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, help="Simplify trails to within this many pixels"
+    )
+    parser.add_argument(
+        "--simplify", type=Simplification, default=Simplification.CURVES
+    )
+    parser.add_argument("--dt", type=float, help="Fixed timestep in seconds")
+    parser.add_argument("--max-steps", type=int)
     parser.add_argument("--seed", type=int)
 
     parser.set_defaults(func=main)
@@ -37,25 +49,38 @@ def main(args, config):
         make_chamber(rng, args.magnet, args.friction),
         generate_particles(rng, width, height, args.n_particles, args.allow_3d),
         rng,
+        dt=args.dt,
     )
 
-    out_file = (
-        config["output_dir"]
-        / f"bubblechamber_{dt.datetime.now().isoformat().replace(':', '-')}.svg"
-    )
+    out_file = output_file(config, "bubblechamber", "svg")
     surface = cairo.SVGSurface(str(out_file), width, height)
     renderer = BubbleChamberRenderer(
-        surface, rng, width, height, args.colorscheme, args.linewidth
+        surface,
+        rng,
+        width,
+        height,
+        args.colorscheme,
+        args.linewidth,
+        streaming=args.stream,
+        tolerance=args.tolerance,
+        simplification=args.simplify,
     )
 
     fps = FPSCounter()
 
     sim.start()
     fps.start()
-    while any(p.is_dirty for p in sim.particles):
+    steps = 0
+    while sim.particles.is_dirty.any():
+        if args.max_steps is not None and steps >= args.max_steps:
+            break
         sim.step()
+        steps += 1
         renderer.render(sim)
         fps.frame_done()
 
     renderer.finalize(sim)
     surface.finish()
+
+    if args.tolerance is not None:
+        log.info("Simplified trails: %s", renderer.reduction)
@@ -2,6 +2,7 @@ from typing import Sequence
 
 import numpy as np
 from numpy.random import Generator
+from numpy.typing import ArrayLike
 
 from .models import BubbleChamber, Particle, SplitTree
 
@@ -14,7 +15,7 @@ def make_chamber(
     )
 
 
-def random_charges(rng: Generator) -> Sequence[int]:
+def random_charges(rng: Generator) -> np.ndarray:
     return rng.choice([-2, -1, 1, 2], size=rng.integers(low=5, high=100))
 
 
@@ -38,9 +39,9 @@ def random_split_tree(rng: Generator, mass: int) -> SplitTree:
 
 def make_particle(
     rng: Generator,
-    pos: Sequence[float],
-    velocity: Sequence[float],
-    charges: Sequence[int] = None,
+    pos: ArrayLike,
+    velocity: ArrayLike,
+    charges: np.ndarray = None,
     split_tree: SplitTree = None,
 ) -> Particle:
     charges = charges if charges is not None else random_charges(rng)
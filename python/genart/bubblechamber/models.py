@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
-from typing import Sequence
+from typing import List, Sequence
 
 import numpy as np
+from numpy.typing import ArrayLike
 
 
 @dataclass
@@ -19,37 +20,135 @@ class SplitTree:
             )
 
 
-@dataclass
 class Particle:
-    position: Sequence[float]
-    velocity: Sequence[float]
-    charges: Sequence[int]
-    decays_after: float
-    split_tree: SplitTree
-    lifetime: float = 0.0
-    is_alive: bool = True
-    is_dirty: bool = True
-
-    def __post_init__(self):
-        if not isinstance(self.position, np.ndarray):
-            self.position = np.array(self.position)
-
-        if not isinstance(self.velocity, np.ndarray):
-            self.velocity = np.array(self.velocity)
-
-        if not isinstance(self.charges, np.ndarray):
-            self.charges = np.array(self.charges)
+    __slots__ = (
+        "position",
+        "velocity",
+        "charges",
+        "decays_after",
+        "split_tree",
+        "lifetime",
+        "is_alive",
+        "is_dirty",
+        "total_charge",
+        "mass",
+        "inv_mass",
+    )
+
+    def __init__(
+        self,
+        position: ArrayLike,
+        velocity: ArrayLike,
+        charges: ArrayLike,
+        decays_after: float,
+        split_tree: SplitTree,
+        lifetime: float = 0.0,
+        is_alive: bool = True,
+        is_dirty: bool = True,
+    ):
+        self.position = np.asarray(position)
+        self.velocity = np.asarray(velocity)
+        self.charges = np.asarray(charges)
+        self.decays_after = decays_after
+        self.split_tree = split_tree
+        self.lifetime = lifetime
+        self.is_alive = is_alive
+        self.is_dirty = is_dirty
+
+        # Charges never change, so neither do these:
+        self.total_charge: int = int(np.sum(self.charges))
+        self.mass: int = len(self.charges)
 
         if not self.mass == self.split_tree.count:
             raise ValueError(f"Invalid SplitTree {self.split_tree} for particle {self}")
 
-    @property
-    def total_charge(self) -> int:
-        return np.sum(self.charges)
+        self.inv_mass: float = 1.0 / self.mass
+
+    def __repr__(self) -> str:
+        return (
+            f"Particle(position={self.position!r}, velocity={self.velocity!r}, "
+            f"charges={self.charges!r}, decays_after={self.decays_after!r}, "
+            f"split_tree={self.split_tree!r}, lifetime={self.lifetime!r}, "
+            f"is_alive={self.is_alive!r}, is_dirty={self.is_dirty!r})"
+        )
+
+
+class ParticleStore:
+    """
+    All particles of a simulation as a structure of arrays, indexed by the order
+    they were added in. Indices are stable: dead particles stay in the store.
+    Storage doubles whenever it's full, so adding particles is amortized O(1).
+    """
+
+    _ARRAYS = (
+        "position",
+        "velocity",
+        "total_charge",
+        "mass",
+        "inv_mass",
+        "lifetime",
+        "decays_after",
+        "is_alive",
+        "is_dirty",
+    )
+
+    def __init__(self, capacity: int = 64):
+        self.position = np.zeros((capacity, 3))
+        self.velocity = np.zeros((capacity, 3))
+        self.total_charge = np.zeros(capacity)
+        self.mass = np.zeros(capacity)
+        self.inv_mass = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity)
+        self.decays_after = np.zeros(capacity)
+        self.is_alive = np.zeros(capacity, dtype=bool)
+        self.is_dirty = np.zeros(capacity, dtype=bool)
+
+        # Only needed when a particle decays:
+        self.charges: List[np.ndarray] = []
+        self.split_trees: List[SplitTree] = []
+
+    def __len__(self) -> int:
+        return len(self.split_trees)
 
     @property
-    def mass(self) -> int:
-        return len(self.charges)
+    def capacity(self) -> int:
+        return len(self.mass)
+
+    def reserve(self, size: int):
+        """Makes room for at least `size` particles"""
+        if size <= self.capacity:
+            return
+
+        capacity = self.capacity
+        while capacity < size:
+            capacity *= 2
+        for name in self._ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def extend(self, particles: Sequence[Particle]) -> range:
+        """Adds particles all at once, and returns their indices"""
+        added = range(len(self), len(self) + len(particles))
+        if not particles:
+            return added
+        self.reserve(added.stop)
+
+        new = slice(added.start, added.stop)
+        self.position[new] = [p.position for p in particles]
+        self.velocity[new] = [p.velocity for p in particles]
+        self.total_charge[new] = [p.total_charge for p in particles]
+        self.mass[new] = [p.mass for p in particles]
+        self.inv_mass[new] = [p.inv_mass for p in particles]
+        self.lifetime[new] = [p.lifetime for p in particles]
+        self.decays_after[new] = [p.decays_after for p in particles]
+        self.is_alive[new] = [p.is_alive for p in particles]
+        self.is_dirty[new] = [p.is_dirty for p in particles]
+        self.charges.extend(p.charges for p in particles)
+        self.split_trees.extend(p.split_tree for p in particles)
+
+        return added
 
 
 @dataclass
@@ -1,15 +1,15 @@
-from collections import defaultdict
 from enum import Enum
 from math import log, pi
-from typing import DefaultDict, Dict
+from typing import Iterator, List, Optional, Sequence, Tuple
 
 import cairo
+import numpy as np
 from numpy.random import Generator
 
 from genart import cairoctx
 from genart.color import Color, RadialGradient
+from genart.simplify import Reduction, Simplification, sampled_path, simplify
 
-from .models import Particle
 from .simulation import Simulation
 
 
@@ -17,7 +17,7 @@ class ColorScheme(Enum):
     BW = "bw"
     COMIC = "comic"
 
-    def gen_color(self, rng: Generator, particle: Particle):
+    def gen_color(self, rng: Generator):
         if self is ColorScheme.COMIC:
             hue = rng.random()
             sat = rng.uniform(0.5, 1.0)
@@ -32,6 +32,79 @@ class LineWidth(Enum):
     DEPTH = "depth"
 
 
+class TrailStore:
+    """
+    Trail samples of all particles in one growable buffer, in the order they
+    were recorded, each tagged with the index of its particle.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.points = np.zeros((capacity, 2))
+        self.owners = np.zeros(capacity, dtype=np.int32)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, owners: np.ndarray, points: np.ndarray):
+        """Records one sample of each of the particles `owners` at `points`"""
+        end = self._size + len(owners)
+        if end > len(self.owners):
+            capacity = max(end, 2 * len(self.owners))
+            self.points = np.resize(self.points, (capacity, 2))
+            self.owners = np.resize(self.owners, capacity)
+
+        self.points[self._size : end] = points
+        self.owners[self._size : end] = owners
+        self._size = end
+
+    def trails(self, first: Sequence[int] = ()) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        The (particle index, (n, 2) samples) of all trails. The trails of the
+        particles in `first` come first in that order, the others by particle index.
+        """
+        owners = self.owners[: self._size]
+        if not len(owners):
+            return iter(())
+
+        order = np.asarray(first, dtype=np.intp)
+        size = max(owners.max(), order.max(initial=-1)) + 1
+        rank = np.arange(size) + len(order)
+        rank[order] = np.arange(len(order))
+
+        return _grouped(owners, self.points[: self._size], rank[owners])
+
+    def pop_trails(self, owners: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+        """Removes the trails of the particles `owners`, and returns them like `trails`"""
+        popped = np.isin(self.owners[: self._size], owners)
+        if not popped.any():
+            return iter(())
+
+        owners = self.owners[: self._size][popped]
+        res = _grouped(owners, self.points[: self._size][popped], owners)
+
+        kept = ~popped
+        self._size = int(kept.sum())
+        self.points[: self._size] = self.points[: len(kept)][kept]
+        self.owners[: self._size] = self.owners[: len(kept)][kept]
+
+        return res
+
+
+def _grouped(
+    owners: np.ndarray, points: np.ndarray, keys: np.ndarray
+) -> Iterator[Tuple[int, np.ndarray]]:
+    # Sorting is stable, so the samples of each trail stay in order:
+    order = np.argsort(keys, kind="stable")
+    owners = owners[order]
+    points = points[order]
+
+    starts = np.flatnonzero(np.diff(owners, prepend=-1))
+    ends = np.append(starts[1:], len(owners))
+    for owner, start, end in zip(owners[starts].tolist(), starts, ends):
+        yield owner, points[start:end]
+
+
 class BubbleChamberRenderer:
     def __init__(
         self,
@@ -42,6 +115,9 @@ class BubbleChamberRenderer:
         color_scheme: ColorScheme = ColorScheme.BW,
         line_width: LineWidth = LineWidth.CONSTANT,
         fps: int = 120,
+        streaming: bool = False,
+        tolerance: Optional[float] = None,
+        simplification: Simplification = Simplification.CURVES,
     ):
         self.ctx: cairo.Context = cairo.Context(surface)
         self.ctx.set_source_rgba(0, 0, 0, 1)
@@ -59,63 +135,99 @@ class BubbleChamberRenderer:
         self._frame_time = 1 / self.fps
 
         self.last_frame_time = 0.0
-        self.trails: DefaultDict = defaultdict(list)
-        self.particle_props: Dict[int, Particle] = {}
+        self.trails = TrailStore()
+
+        # Stroke trails as soon as their particles are done, instead of at the end:
+        self.streaming = streaming
+        # Trails are stroked in the order their particles were done:
+        self._done: List[np.ndarray] = []
+
+        # Simplify trails to within this many pixels before stroking them:
+        self.tolerance = tolerance
+        self.simplification = simplification
+        self.reduction = Reduction()
 
     def render(self, sim: Simulation):
         time_passed = sim.time_passed - self.last_frame_time
         if time_passed < self._frame_time:
             return
-        self.last_frame_time = sim.time_passed
-
-        for p in sim.particles:
-            if p.is_alive:
-                self.trail_particle(p)
-            elif p.is_dirty:
-                p.is_dirty = False
-                self.trail_particle(p)
+        if sim.dt is None:
+            self.last_frame_time = sim.time_passed
+        else:
+            # Sample frames on a fixed grid of simulated time, so they don't drift:
+            self.last_frame_time += self._frame_time * (time_passed // self._frame_time)
+
+        ps = sim.particles
+        alive = ps.is_alive[: len(ps)]
+        dirty = ps.is_dirty[: len(ps)]
+        to_trail = np.flatnonzero(alive | dirty)
+        done = np.flatnonzero(dirty & ~alive)
+        # Dead particles get one last trail point:
+        dirty[~alive] = False
+
+        self.trail_particles(sim, to_trail)
+
+        # Colors of the comic scheme come from the simulation's rng,
+        # drawing them early would change the simulation:
+        if self.streaming and self.color_scheme is not ColorScheme.COMIC:
+            self._stroke_trails(sim, self.trails.pop_trails(done))
+        elif len(done):
+            self._done.append(done)
 
     def finalize(self, sim: Simulation):
-        for id, p in self.trails.items():
-            props = self.particle_props[id]
+        done = np.concatenate(self._done) if self._done else ()
+        self._stroke_trails(sim, self.trails.trails(done))
 
+        if self.color_scheme is ColorScheme.COMIC:
+            # Overlay a lightening radial gradient to create a "bang".
+            grad = RadialGradient(
+                (Color(1.0, 1.0, 1.0, 0.9), Color(1.0, 1.0, 1.0, 0.0))
+            )
+            mid_x = self.width / 2.0
+            mid_y = self.height / 2.0
+            radius = min(self.width, self.height) / 4.0
+            with cairoctx.operator(self.ctx, cairo.Operator.ATOP), cairoctx.source(
+                self.ctx, grad.to_pattern(mid_x, mid_y, radius)
+            ):
+                self.ctx.arc(mid_x, mid_y, radius, 0.0, pi * 2)
+                self.ctx.fill()
+
+    def _stroke_trails(self, sim: Simulation, trails: Iterator[Tuple[int, np.ndarray]]):
+        ps = sim.particles
+
+        for idx, trail in trails:
             if self.line_width is LineWidth.MASS:
-                lw = log(props.mass) + 0.1
+                lw = log(ps.mass[idx]) + 0.1
                 self.ctx.set_line_width(lw)
             elif self.line_width is LineWidth.CHARGE:
-                lw = log(abs(props.total_charge))
+                lw = log(abs(ps.total_charge[idx]))
                 self.ctx.set_line_width(lw)
             elif self.line_width is LineWidth.DEPTH:
-                lw = 2.0 + 0.01 * props.position[2]
+                lw = 2.0 + 0.01 * ps.position[idx, 2]
                 self.ctx.set_line_width(lw)
 
             if self.color_scheme is ColorScheme.BW:
                 color = Color(0.0, 0.0, 0.0)
             else:
-                color = self.color_scheme.gen_color(self.rng, props)
+                color = self.color_scheme.gen_color(self.rng)
 
-            self.ctx.move_to(*p[0])
-            for control_point, destination in zip(p[1::2], p[2::2]):
-                self.ctx.curve_to(*control_point, *control_point, *destination)
+            path = sampled_path(trail)
+            if self.tolerance is not None:
+                simplified = simplify(trail, self.tolerance, self.simplification)
+                self.reduction.add(len(path), len(simplified))
+                path = simplified
+
+            self.ctx.move_to(*path.points[0].tolist())
+            for controls, destination in path.segments():
+                if controls is None:
+                    self.ctx.line_to(*destination)
+                else:
+                    self.ctx.curve_to(*controls, *destination)
 
             with cairoctx.source(self.ctx, color.to_pattern()):
                 self.ctx.stroke()
 
-        if self.color_scheme is ColorScheme.COMIC:
-            # Overlay a lightening radial gradient to create a "bang".
-            grad = RadialGradient(
-                (Color(1.0, 1.0, 1.0, 0.9), Color(1.0, 1.0, 1.0, 0.0))
-            )
-            mid_x = self.width / 2.0
-            mid_y = self.height / 2.0
-            radius = min(self.width, self.height) / 4.0
-            with cairoctx.operator(self.ctx, cairo.Operator.ATOP), cairoctx.source(
-                self.ctx, grad.to_pattern(mid_x, mid_y, radius)
-            ):
-                self.ctx.arc(mid_x, mid_y, radius, 0.0, pi * 2)
-                self.ctx.fill()
-
-    def trail_particle(self, p: Particle):
-        if p.total_charge != 0:
-            self.trails[id(p)].append(tuple(p.position[:2]))
-            self.particle_props[id(p)] = p
+    def trail_particles(self, sim: Simulation, idx: np.ndarray):
+        ps = sim.particles
+        idx = idx[ps.total_charge[idx] != 0]
+        self.trails.append(idx, ps.position[idx, :2])
@@ -1,11 +1,11 @@
 from time import perf_counter
-from typing import List, Sequence
+from typing import List, Optional, Sequence
 
 import numpy as np
 from numpy.random import Generator
 
 from .generator import make_particle
-from .models import BubbleChamber, Particle
+from .models import BubbleChamber, Particle, ParticleStore
 
 
 class Simulation:
@@ -15,73 +15,88 @@ class Simulation:
         particles: Sequence[Particle],
         rng: Generator,
         time_modifier: float = 1.0,
+        dt: Optional[float] = None,
     ):
         self.chamber: BubbleChamber = chamber
-        self.particles: Sequence[Particle] = particles
+        self.particles = ParticleStore()
+        self.particles.extend(particles)
         self.rng = rng
         self.time_modifier = time_modifier
+        # Fixed timestep, instead of following the wall clock:
+        self.dt = dt
 
         self.clock: float = 0.0
         self.time_passed: float = 0.0
-        self.new_part_buffer: List[Particle] = []
 
     def start(self):
-        self.clock = perf_counter()
+        self.clock = perf_counter() if self.dt is None else 0.0
 
     def step(self):
-        now = perf_counter()
-        tdelta = (now - self.clock) * self.time_modifier
+        if self.dt is None:
+            now = perf_counter()
+            tdelta = (now - self.clock) * self.time_modifier
+            self.clock = now
+        else:
+            # Simulated clock: runs are reproducible and as fast as the CPU allows
+            tdelta = self.dt * self.time_modifier
+            self.clock += self.dt
         self.time_passed += tdelta
-        self.clock = now
 
-        for p in self.particles:
-            if p.is_alive:
-                self._update_particle(p, tdelta)
-        if self.new_part_buffer:
-            self.particles.extend(self.new_part_buffer)
-            self.new_part_buffer = []
+        ps = self.particles
+        alive = np.flatnonzero(ps.is_alive[: len(ps)])
 
-    def _update_particle(self, p: Particle, tdelta: float):
         # Update lifetime
-        p.lifetime += tdelta
-        if p.lifetime >= p.decays_after:
-            p.is_alive = False
-
-            # Decay into smaller particles
-            if p.mass > 1:
-                self.split_particle(p)
-        else:
-            # Magnetic component of Lorentz force:
-            mag_force = p.total_charge * np.cross(
-                p.velocity, self.chamber._magnet_vector
-            )
-
-            # Apply force:
-            # F = m.a, so a = F / m
-            acceleration = mag_force / p.mass
-            p.velocity += acceleration * tdelta
-
-            # Friction:
-            p.velocity *= 1.0 - (self.chamber.friction * tdelta)
-
-            # Apply velocity:
-            p.position += p.velocity * tdelta
-
-    def split_particle(self, p: Particle):
-        if p.mass == 1:
-            return
-
+        ps.lifetime[alive] += tdelta
+        decays = ps.lifetime[alive] >= ps.decays_after[alive]
+        decayed = alive[decays]
+        moving = alive[~decays]
+        ps.is_alive[decayed] = False
+
+        # Magnetic component of Lorentz force:
+        velocity = ps.velocity[moving]
+        mag_force = ps.total_charge[moving, None] * np.cross(
+            velocity, self.chamber._magnet_vector
+        )
+
+        # Apply force:
+        # F = m.a, so a = F / m
+        acceleration = mag_force * ps.inv_mass[moving, None]
+        velocity += acceleration * tdelta
+
+        # Friction:
+        velocity *= 1.0 - (self.chamber.friction * tdelta)
+
+        # Apply velocity:
+        ps.velocity[moving] = velocity
+        ps.position[moving] += velocity * tdelta
+
+        # Decay into smaller particles
+        new_particles: List[Particle] = []
+        for idx in decayed[ps.mass[decayed] > 1].tolist():
+            new_particles.extend(self.split_particle(idx))
+        ps.extend(new_particles)
+
+    def split_particle(self, idx: int) -> List[Particle]:
+        """The particles that particle `idx` decays into"""
+        ps = self.particles
+        charges = ps.charges[idx]
+        if len(charges) == 1:
+            return []
+
+        res = []
         i = 0
-        for split in p.split_tree.parts:
-            atoms = p.charges[i : i + split.count]
+        for split in ps.split_trees[idx].parts:
+            atoms = charges[i : i + split.count]
             i += split.count
 
-            self.new_part_buffer.append(
+            res.append(
                 make_particle(
                     self.rng,
-                    p.position.copy(),
-                    p.velocity.copy(),
+                    ps.position[idx].copy(),
+                    ps.velocity[idx].copy(),
                     atoms,
                     split,
                 )
             )
+
+        return res
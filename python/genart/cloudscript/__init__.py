@@ -1,4 +1,3 @@
-import datetime as dt
 import logging
 import sys
 
@@ -6,7 +5,9 @@ import cairo
 from numpy.random import default_rng
 
 from genart.fps import FPSCounter
+from genart.output import output_file
 from genart.parse import parse_size
+from genart.simplify import Simplification
 
 from .generator import generate_particles, make_superchamber
 from .layout import layout_text
@@ -24,6 +25,14 @@ def register_parser(subparsers):
     parser.add_argument("-s", "--size", default="500x500")
     parser.add_argument("--max-linewidth", type=float, default=2.5)
     parser.add_argument("-g", "--grid", action="store_true")
+    parser.add_argument(
+        "--tolerance", type=float, help="Simplify trails to within this many pixels"
+    )
+    parser.add_argument(
+        "--simplify", type=Simplification, default=Simplification.CURVES
+    )
+    parser.add_argument("--dt", type=float, help="Fixed timestep in seconds")
+    parser.add_argument("--max-steps", type=int)
     parser.add_argument("--seed", type=int)
 
     parser.set_defaults(func=main)
@@ -41,14 +50,16 @@ def main(args, config):
     chamber = make_superchamber(rng, width, height, layout)
     particles = generate_particles(rng, chamber)
 
-    sim = Simulation(chamber, particles)
+    sim = Simulation(chamber, particles, dt=args.dt)
 
-    out_file = (
-        config["output_dir"]
-        / f"cloudscript_{dt.datetime.now().isoformat().replace(':', '-')}.svg"
-    )
+    out_file = output_file(config, "cloudscript", "svg")
     surface = cairo.SVGSurface(str(out_file), width, height)
-    renderer = BubbleChamberRenderer(surface, max_linewidth=args.max_linewidth)
+    renderer = BubbleChamberRenderer(
+        surface,
+        max_linewidth=args.max_linewidth,
+        tolerance=args.tolerance,
+        simplification=args.simplify,
+    )
 
     if args.grid:
         renderer.add_grid(width, height, chamber.rows, chamber.columns)
@@ -57,10 +68,17 @@ def main(args, config):
 
     sim.start()
     fps.start()
+    steps = 0
     while any(p.is_dirty for p in sim.particles):
+        if args.max_steps is not None and steps >= args.max_steps:
+            break
         sim.step()
+        steps += 1
         renderer.render(sim)
         fps.frame_done()
 
     renderer.finalize(sim)
     surface.finish()
+
+    if args.tolerance is not None:
+        log.info("Simplified trails: %s", renderer.reduction)
@@ -2,6 +2,7 @@ from typing import Dict, List, Optional, Sequence
 
 import numpy as np
 from numpy.random import Generator
+from numpy.typing import ArrayLike
 
 from genart.geom import unit_vector
 
@@ -42,7 +43,7 @@ def random_chamber(rng: Generator) -> BubbleChamber:
     return BubbleChamber(magnetic_field, friction)
 
 
-def random_charges(rng: Generator) -> Sequence[int]:
+def random_charges(rng: Generator) -> np.ndarray:
     return rng.choice([-2, -1, 1, 2], size=rng.integers(low=2, high=6))
 
 
@@ -66,12 +67,12 @@ def random_split_tree(rng: Generator, mass: int) -> SplitTree:
 
 def random_particle(
     rng: Generator,
-    pos: Sequence[float],
-    velocity: Sequence[float],
+    pos: ArrayLike,
+    velocity: ArrayLike,
     lifetime: float = None,
-    charges: Sequence[int] = None,
+    charges: np.ndarray = None,
 ) -> Particle:
-    charges = charges or random_charges(rng)
+    charges = charges if charges is not None else random_charges(rng)
     lifetime = lifetime or rng.uniform(0.7, 3.5)
     tree = random_split_tree(rng, len(charges))
 
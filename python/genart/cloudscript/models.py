@@ -1,9 +1,10 @@
 from dataclasses import dataclass, field
 from functools import cached_property
 from numbers import Real
-from typing import Sequence
+from typing import Any, Callable, Sequence, Tuple
 
 import numpy as np
+from numpy.typing import ArrayLike
 
 
 @dataclass
@@ -21,39 +22,59 @@ class SplitTree:
             )
 
 
-@dataclass
 class Particle:
-    position: Sequence[float]
-    velocity: Sequence[float]
-    charges: Sequence[int]
-    decays_after: float
-    split_tree: SplitTree
-    lifetime: float = 0.0
-    is_alive: bool = True
-    is_dirty: bool = True
-
-    def __post_init__(self):
-        if not isinstance(self.position, np.ndarray):
-            self.position = np.array(self.position)
-
-        if not isinstance(self.velocity, np.ndarray):
-            self.velocity = np.array(self.velocity)
-
-        if not isinstance(self.charges, np.ndarray):
-            self.charges = np.array(self.charges)
+    __slots__ = (
+        "position",
+        "velocity",
+        "charges",
+        "decays_after",
+        "split_tree",
+        "lifetime",
+        "is_alive",
+        "is_dirty",
+        "total_charge",
+        "mass",
+        "inv_mass",
+    )
+
+    def __init__(
+        self,
+        position: ArrayLike,
+        velocity: ArrayLike,
+        charges: ArrayLike,
+        decays_after: float,
+        split_tree: SplitTree,
+        lifetime: float = 0.0,
+        is_alive: bool = True,
+        is_dirty: bool = True,
+    ):
+        self.position = np.asarray(position)
+        self.velocity = np.asarray(velocity)
+        self.charges = np.asarray(charges)
+        self.decays_after = decays_after
+        self.split_tree = split_tree
+        self.lifetime = lifetime
+        self.is_alive = is_alive
+        self.is_dirty = is_dirty
+
+        # Charges never change, so neither do these:
+        self.total_charge: int = int(np.sum(self.charges))
+        self.mass: int = len(self.charges)
 
         if not self.mass == self.split_tree.count:
             raise ValueError(f"Invalid SplitTree {self.split_tree} for particle {self}")
 
-        self.decays_after = 1.0 * self.mass
+        self.inv_mass: float = 1.0 / self.mass
 
-    @property
-    def total_charge(self) -> int:
-        return np.sum(self.charges)
+        self.decays_after = 1.0 * self.mass
 
-    @property
-    def mass(self) -> int:
-        return len(self.charges)
+    def __repr__(self) -> str:
+        return (
+            f"Particle(position={self.position!r}, velocity={self.velocity!r}, "
+            f"charges={self.charges!r}, decays_after={self.decays_after!r}, "
+            f"split_tree={self.split_tree!r}, lifetime={self.lifetime!r}, "
+            f"is_alive={self.is_alive!r}, is_dirty={self.is_dirty!r})"
+        )
 
 
 @dataclass
@@ -90,11 +111,39 @@ class SuperChamber:
     def col_width(self) -> int:
         return self.width // self.columns
 
+    @cached_property
+    def magnet_vectors(self) -> np.ndarray:
+        """
+        The (rows + 1, columns + 1, 2) magnet vectors of the chambers. The last row
+        and column hold the default chamber, for positions outside of the grid.
+        """
+        return self._grid(lambda c: c._magnet_vector)
+
+    @cached_property
+    def frictions(self) -> np.ndarray:
+        """The (rows + 1, columns + 1) frictions of the chambers, like `magnet_vectors`"""
+        return self._grid(lambda c: c.friction)
+
+    def _grid(self, attr: Callable[[BubbleChamber], Any]) -> np.ndarray:
+        default = attr(self.default_chamber)
+        grid = [[attr(c) for c in row] + [default] for row in self.chambers]
+        grid.append([default] * (self.columns + 1))
+
+        return np.array(grid, dtype=float)
+
+    def cells_at(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """The row and column indices into the chamber grids of the (n, 2) positions"""
+        rows = positions[:, 1] // self.row_height
+        cols = positions[:, 0] // self.col_width
+        rows[(rows < 0) | (rows >= self.rows)] = self.rows
+        cols[(cols < 0) | (cols >= self.columns)] = self.columns
+
+        return rows.astype(np.intp), cols.astype(np.intp)
+
     def chamber_at(self, x: Real, y: Real) -> BubbleChamber:
         row = int(y // self.row_height)
         col = int(x // self.col_width)
 
-        try:
+        if 0 <= row < self.rows and 0 <= col < self.columns:
             return self.chambers[row][col]
-        except IndexError:
-            return self.default_chamber
+        return self.default_chamber
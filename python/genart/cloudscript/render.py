@@ -1,11 +1,14 @@
 from collections import defaultdict
-from math import pi, sin
-from typing import DefaultDict
+from math import pi
+from typing import DefaultDict, Optional
 
 import cairo
+import numpy as np
 
 from genart import cairoctx
 from genart.color import Color
+from genart.simplify import Reduction, Simplification, sampled_path, simplify
+from genart.stroke import variable_width_outline
 
 from .models import Particle
 from .simulation import Simulation
@@ -13,7 +16,12 @@ from .simulation import Simulation
 
 class BubbleChamberRenderer:
     def __init__(
-        self, surface: cairo.Surface, fps: int = 120, max_linewidth: float = 4.0
+        self,
+        surface: cairo.Surface,
+        fps: int = 120,
+        max_linewidth: float = 4.0,
+        tolerance: Optional[float] = None,
+        simplification: Simplification = Simplification.CURVES,
     ):
         self.ctx: cairo.Context = cairo.Context(surface)
         self.ctx.set_source_rgba(0, 0, 0, 1)
@@ -27,6 +35,11 @@ class BubbleChamberRenderer:
         self.last_frame_time = 0.0
         self.trails: DefaultDict = defaultdict(list)
 
+        # Simplify trails to within this many pixels before stroking them:
+        self.tolerance = tolerance
+        self.simplification = simplification
+        self.reduction = Reduction()
+
     def add_grid(self, width: float, height: float, rows: int, cols: int):
         rowheight = height // rows
         colwidth = width // cols
@@ -48,7 +61,11 @@ class BubbleChamberRenderer:
         time_passed = sim.time_passed - self.last_frame_time
         if time_passed < self._frame_time:
             return
-        self.last_frame_time = sim.time_passed
+        if sim.dt is None:
+            self.last_frame_time = sim.time_passed
+        else:
+            # Sample frames on a fixed grid of simulated time, so they don't drift:
+            self.last_frame_time += self._frame_time * (time_passed // self._frame_time)
 
         for p in sim.particles:
             if p.is_alive:
@@ -59,17 +76,28 @@ class BubbleChamberRenderer:
 
     def finalize(self, sim: Simulation):
         for p in self.trails.values():
-            trail_len = len(p)
-
-            self.ctx.move_to(*p[0])
-            for i, (control_point, destination) in enumerate(zip(p[1::2], p[2::2])):
-                # Ease the line width like a half-sine, being thickest in the middle
-                progress_pct = i / (trail_len / 2)
-                linewidth_pct = sin(progress_pct * pi)
-                self.ctx.set_line_width(linewidth_pct * self.max_linewidth)
-                self.ctx.curve_to(*control_point, *control_point, *destination)
-                self.ctx.stroke()
-                self.ctx.move_to(*destination)
+            trail = np.array(p)
+            trail_len = len(trail)
+
+            path = sampled_path(trail)
+            if self.tolerance is not None:
+                simplified = simplify(trail, self.tolerance, self.simplification)
+                self.reduction.add(len(path), len(simplified))
+                path = simplified
+
+            # Ease the line width like a half-sine, being thickest in the middle
+            def width(samples: np.ndarray) -> np.ndarray:
+                return np.sin(samples / trail_len * pi) * self.max_linewidth
+
+            outline = variable_width_outline(path, width).tolist()
+            if not outline:
+                continue
+
+            self.ctx.move_to(*outline[0][0])
+            for _, c1, c2, destination in outline:
+                self.ctx.curve_to(*c1, *c2, *destination)
+            self.ctx.close_path()
+            self.ctx.fill()
 
     def trail_particle(self, p: Particle):
         if p.total_charge != 0.0:
@@ -1,5 +1,5 @@
 from time import perf_counter
-from typing import List, Sequence
+from typing import List, Optional, Sequence
 
 import numpy as np
 
@@ -12,61 +12,82 @@ class Simulation:
         chamber: SuperChamber,
         particles: Sequence[Particle],
         time_modifier: float = 1.0,
+        dt: Optional[float] = None,
     ):
         self.chamber: SuperChamber = chamber
         self.particles: Sequence[Particle] = particles
         self.time_modifier = time_modifier
+        # Fixed timestep, instead of following the wall clock:
+        self.dt = dt
 
         self.clock: float = 0.0
         self.time_passed: float = 0.0
         self.new_part_buffer: List[Particle] = []
 
     def start(self):
-        self.clock = perf_counter()
+        self.clock = perf_counter() if self.dt is None else 0.0
 
     def step(self):
-        now = perf_counter()
-        tdelta = (now - self.clock) * self.time_modifier
+        if self.dt is None:
+            now = perf_counter()
+            tdelta = (now - self.clock) * self.time_modifier
+            self.clock = now
+        else:
+            # Simulated clock: runs are reproducible and as fast as the CPU allows
+            tdelta = self.dt * self.time_modifier
+            self.clock += self.dt
         self.time_passed += tdelta
-        self.clock = now
 
+        moving = []
         for p in self.particles:
             if p.is_alive:
-                self._update_particle(p, tdelta)
+                # Update lifetime
+                p.lifetime += tdelta
+                if p.lifetime >= p.decays_after:
+                    p.is_alive = False
+
+                    # Decay into smaller particles
+                    if p.mass > 1:
+                        self.split_particle(p)
+                else:
+                    moving.append(p)
+
+        if moving:
+            self._move_particles(moving, tdelta)
         if self.new_part_buffer:
             self.particles.extend(self.new_part_buffer)
             self.new_part_buffer = []
 
-    def _update_particle(self, p: Particle, tdelta: float):
-        # Update lifetime
-        p.lifetime += tdelta
-        if p.lifetime >= p.decays_after:
-            p.is_alive = False
+    def _move_particles(self, particles: Sequence[Particle], tdelta: float):
+        position = np.array([p.position for p in particles])
+        velocity = np.array([p.velocity for p in particles])
+        total_charge = np.array([p.total_charge for p in particles])
+        inv_mass = np.array([p.inv_mass for p in particles])
 
-            # Decay into smaller particles
-            if p.mass > 1:
-                self.split_particle(p)
-        else:
-            # Find in which chamber this particle is:
-            chamber = self.chamber.chamber_at(*p.position)
-
-            # Magnetic component of Lorentz force:
-            # 2D HACK: Since we assume the magnetic field is pointed straight at us (e.g. [0, 0, x]),
-            # We can shortcut the cross-product:
-            mag_force = p.total_charge * (
-                chamber._magnet_vector * np.flipud(p.velocity)
-            )
+        # Find in which chamber each particle is:
+        cells = self.chamber.cells_at(position)
+        magnet_vector = self.chamber.magnet_vectors[cells]
+        friction = self.chamber.frictions[cells]
+
+        # Magnetic component of Lorentz force:
+        # 2D HACK: Since we assume the magnetic field is pointed straight at us (e.g. [0, 0, x]),
+        # We can shortcut the cross-product:
+        mag_force = total_charge[:, np.newaxis] * (magnet_vector * velocity[:, ::-1])
+
+        # Apply force:
+        # F = m.a, so a = F / m
+        acceleration = mag_force * inv_mass[:, np.newaxis]
+        velocity += acceleration * tdelta
 
-            # Apply force:
-            # F = m.a, so a = F / m
-            acceleration = mag_force / p.mass
-            p.velocity += acceleration * tdelta
+        # Friction:
+        velocity *= (1.0 - (friction * tdelta))[:, np.newaxis]
 
-            # Friction:
-            p.velocity *= 1.0 - (chamber.friction * tdelta)
+        # Apply velocity:
+        position += velocity * tdelta
 
-            # Apply velocity:
-            p.position += p.velocity * tdelta
+        for p, pos, vel in zip(particles, position, velocity):
+            p.position[:] = pos
+            p.velocity[:] = vel
 
     def split_particle(self, p: Particle):
         if p.mass == 1:
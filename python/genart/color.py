@@ -1,6 +1,7 @@
 import colorsys
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Sequence
+from typing import Callable, Hashable, Sequence
 
 import cairo
 
@@ -11,7 +12,57 @@ def hex_to_rgb(value):
     return tuple(int(value[i : i + lv // 3], 16) for i in range(0, lv, lv // 3))
 
 
-@dataclass
+class PatternCache:
+    """
+    Cairo patterns shared by every use of the same color, instead of allocated
+    per draw. Beyond `max_size`, the least recently used are dropped. Patterns
+    are handed out to many callers, so they must not be modified.
+
+    Gradients aren't cached: they're positioned per shape, so they'd hardly ever
+    be reused.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self._patterns: "OrderedDict[Hashable, cairo.Pattern]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def __str__(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return (
+            f"{self.misses} allocated, {self.hits} reused ({rate:.1%}), "
+            f"{len(self)} cached"
+        )
+
+    def get(self, key: Hashable, make: Callable[[], cairo.Pattern]) -> cairo.Pattern:
+        pattern = self._patterns.get(key)
+        if pattern is not None:
+            self.hits += 1
+            self._patterns.move_to_end(key)
+            return pattern
+
+        self.misses += 1
+        pattern = self._patterns[key] = make()
+        if len(self._patterns) > self.max_size:
+            self._patterns.popitem(last=False)
+
+        return pattern
+
+    def clear(self):
+        self.hits = self.misses = 0
+        self._patterns.clear()
+
+
+PATTERNS = PatternCache()
+
+
+@dataclass(frozen=True)
 class Color:
     r: float
     g: float
@@ -27,28 +78,37 @@ class Color:
         return cls(*colorsys.hsv_to_rgb(hue, sat, val))
 
     def to_pattern(self):
-        return cairo.SolidPattern(self.r, self.g, self.b, self.a)
+        return PATTERNS.get(
+            self, lambda: cairo.SolidPattern(self.r, self.g, self.b, self.a)
+        )
 
 
-@dataclass
+@dataclass(frozen=True)
 class LinearGradient:
     stops: Sequence[Color]
 
+    def __post_init__(self):
+        object.__setattr__(self, "stops", tuple(self.stops))
+
     def to_pattern(self, x1: float, y1: float, x2: float, y2: float):
         pat = cairo.LinearGradient(x1, y1, x2, y2)
-        for i, stop in enumerate(self.stops):
-            pat.add_color_stop_rgba(i, stop.r, stop.g, stop.b, stop.a)
-
+        _add_stops(pat, self.stops)
         return pat
 
 
-@dataclass
+@dataclass(frozen=True)
 class RadialGradient:
     stops: Sequence[Color]
 
+    def __post_init__(self):
+        object.__setattr__(self, "stops", tuple(self.stops))
+
     def to_pattern(self, x: float, y: float, size: float, start_radius: float = 1.0):
         pat = cairo.RadialGradient(x, y, start_radius, x, y, size)
-        for i, stop in enumerate(self.stops):
-            pat.add_color_stop_rgba(i, stop.r, stop.g, stop.b, stop.a)
-
+        _add_stops(pat, self.stops)
         return pat
+
+
+def _add_stops(pat: cairo.Gradient, stops: Sequence[Color]):
+    for i, stop in enumerate(stops):
+        pat.add_color_stop_rgba(i, stop.r, stop.g, stop.b, stop.a)
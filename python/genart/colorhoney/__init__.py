@@ -1,9 +1,9 @@
-import datetime as dt
 import logging
 import sys
 
 import cairo
 
+from genart.output import output_file
 from genart.parse import parse_size
 
 from .honey import ColorHoneyRenderer
@@ -34,10 +34,7 @@ def main(args, config):
 
     width, height = parse_size(args.size)
 
-    out_file = (
-        config["output_dir"]
-        / f"colorhoney_{dt.datetime.now().isoformat().replace(':', '-')}.svg"
-    )
+    out_file = output_file(config, "colorhoney", "svg")
     surface = cairo.SVGSurface(str(out_file), width, height)
 
     if args.tokki:
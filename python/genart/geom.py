@@ -1,6 +1,6 @@
 from functools import wraps
-from math import atan2, cos, sin
-from typing import Iterator, Sequence, Tuple
+from math import atan2, cos, hypot, sin
+from typing import Iterator, Sequence, Tuple, Union
 
 import numpy as np
 
@@ -20,40 +20,80 @@ def _ensure_ndarray(func):
     return wrapper
 
 
+def _are_pairs(*points) -> bool:
+    # Plain (x, y) tuples don't need the detour through numpy:
+    return all(type(p) is tuple and len(p) == 2 for p in points)
+
+
 def slope(p1: Sequence[float], p2: Sequence[float]) -> float:
     return (p2[1] - p1[1]) / (p2[0] - p1[0])
 
 
-@_ensure_ndarray
-def distance(p1: np.ndarray, p2: np.ndarray) -> float:
-    return np.linalg.norm(p1 - p2)
+def distance(
+    p1: Union[np.ndarray, Sequence[float]], p2: Union[np.ndarray, Sequence[float]]
+) -> float:
+    if _are_pairs(p1, p2):
+        return hypot(p1[0] - p2[0], p1[1] - p2[1])
+    return float(distances(p1, p2))
+
+
+def distances(
+    p1: Union[np.ndarray, Sequence[float]], p2: Union[np.ndarray, Sequence[float]]
+) -> np.ndarray:
+    """Distances between the points along the last axis, broadcast against each other"""
+    diff = np.subtract(p1, p2)
+    if diff.shape[-1] == 2:
+        # Cheaper than a norm for the small batches of the packing loops:
+        return np.hypot(diff[..., 0], diff[..., 1])
+    return np.linalg.norm(diff, axis=-1)
 
 
 def angle(p1: Sequence[float], p2: Sequence[float]) -> float:
     return atan2(p2[1] - p1[1], p2[0] - p1[0])
 
 
+def unit_vector(
+    p1: Union[np.ndarray, Sequence[float]], p2: Union[np.ndarray, Sequence[float]]
+) -> np.ndarray:
+    if _are_pairs(p1, p2):
+        dx = p1[0] - p2[0]
+        dy = p1[1] - p2[1]
+        return np.array((dx, dy)) / hypot(dx, dy)
+    return unit_vectors(p1, p2)
+
+
 @_ensure_ndarray
-def unit_vector(p1: np.ndarray, p2: np.ndarray) -> np.ndarray:
+def unit_vectors(p1: np.ndarray, p2: np.ndarray) -> np.ndarray:
     diff = p1 - p2
-    return diff / np.linalg.norm(diff)
+    return diff / np.linalg.norm(diff, axis=-1, keepdims=True)
 
 
-@_ensure_ndarray
 def projected_point_on_line(
-    line_start: np.ndarray, line_end: np.ndarray, p: np.ndarray
+    line_start: Union[np.ndarray, Sequence[float]],
+    line_end: Union[np.ndarray, Sequence[float]],
+    p: Union[np.ndarray, Sequence[float]],
 ) -> np.ndarray:
-    vec_line = line_end - line_start
-    vec_line_len = np.linalg.norm(vec_line)
-    linestart_to_p = p - line_start
-    linestart_to_p_len = np.linalg.norm(linestart_to_p)
-    dp = np.dot(vec_line, linestart_to_p)
+    if _are_pairs(line_start, line_end, p):
+        vx = line_end[0] - line_start[0]
+        vy = line_end[1] - line_start[1]
+        vec_line_len_sq = vx * vx + vy * vy
+        if vec_line_len_sq:
+            dp = vx * (p[0] - line_start[0]) + vy * (p[1] - line_start[1])
+            t = dp / vec_line_len_sq
+            return np.array((line_start[0] + t * vx, line_start[1] + t * vy))
+
+    return project_points_on_line(line_start, line_end, p)
 
-    cosine = dp / (vec_line_len * linestart_to_p_len)
-    proj_len = cosine * linestart_to_p_len
-    proj = line_start + (proj_len * vec_line) / vec_line_len
 
-    return proj
+@_ensure_ndarray
+def project_points_on_line(
+    line_start: np.ndarray, line_end: np.ndarray, points: np.ndarray
+) -> np.ndarray:
+    """Projects (..., 2) `points` on the line through `line_start` and `line_end`"""
+    vec_line = line_end - line_start
+    dp = (points - line_start) @ vec_line
+
+    return line_start + (dp / (vec_line @ vec_line))[..., None] * vec_line
 
 
 def points_along_arc(
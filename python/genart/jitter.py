@@ -2,6 +2,7 @@ from functools import partial
 from itertools import repeat, zip_longest
 from typing import Iterable, Iterator, Tuple, Union, cast
 
+import numpy as np
 from numpy.random import Generator
 
 
@@ -18,3 +19,21 @@ def jitter_points(
 
     for point in points:
         yield tuple(rng.uniform(p - jit, p + jit) for p, jit in agg(point, size))
+
+
+def jitter_array(
+    points: np.ndarray,
+    rng: Generator,
+    size: Union[float, Tuple[float, ...]],
+) -> np.ndarray:
+    """
+    Like `jitter_points`, for an (n, d) array of points at once.
+    A tuple `size` jitters each coordinate by its own amount, 0 past its end.
+    """
+    scale = np.asarray(size, dtype=float)
+    if isinstance(size, tuple):
+        scale = np.pad(scale, (0, max(points.shape[-1] - len(size), 0)))[
+            : points.shape[-1]
+        ]
+
+    return rng.uniform(points - scale, points + scale)
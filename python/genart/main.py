@@ -1,41 +1,77 @@
 import argparse
 import importlib
 import logging
-import pkgutil
+import sys
 from pathlib import Path
-from typing import Iterator
+from typing import Dict, Optional, Sequence, Tuple
 
 from genart import __version__
 
 log = logging.getLogger(__name__)
 
+# Subcommand -> (module that registers it, help).
+# Only the module of the chosen subcommand is imported, keeping startup fast.
+SUBCOMMANDS: Dict[str, Tuple[str, str]] = {
+    "bubblechamber": ("genart.bubblechamber", "Bubble chamber simulation"),
+    "cloudscript": ("genart.cloudscript", "A script made out of tiny bubble chambers"),
+    "colorhoney": ("genart.colorhoney", "Colorhoney writing system by Kim Godgul"),
+    "selene": ("genart.selene", "O Chaire Selene"),
+    "technique": ("genart.techniques", "Visualize techniques"),
+    "wael": ("genart.wael", "He Who Sees and Is Not Seen"),
+    "batch": ("genart.batch", "Render a subcommand for many seeds"),
+}
+
 
 def main():
+    parser = build_parser()
+
+    cfg = {"output_dir": Path("./output/")}
+
+    args = parser.parse_args()
+    logging.basicConfig(
+        format="%(message)s", level=logging.INFO if args.verbose else logging.WARNING
+    )
+    args.func(args, cfg)
+
+    # Subcommands that don't draw colors never import, and so never load, cairo:
+    color = sys.modules.get("genart.color")
+    if color is not None and color.PATTERNS.misses:
+        log.info("Color patterns: %s", color.PATTERNS)
+
+
+def build_parser(argv: Optional[Sequence[str]] = None) -> argparse.ArgumentParser:
+    """
+    The CLI parser for the arguments `argv`, sys.argv by default. Only the
+    subcommand they select gets its real parser, the others are placeholders.
+    """
     parser = argparse.ArgumentParser(
         prog="genart",
         description="Generative art playground",
     )
     parser.add_argument("--version", action="version", version=__version__)
-
-    cfg = {"output_dir": Path("./output/")}
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Report progress and statistics"
+    )
 
     subparsers = parser.add_subparsers(dest="subcommand", required=True)
 
-    for sub_pkg in subpackages():
-        mod = importlib.import_module(sub_pkg.name)
-        if hasattr(mod, "register_parser"):
-            mod.register_parser(subparsers)
+    selected = selected_subcommand(argv)
+    for name, (module, help) in SUBCOMMANDS.items():
+        if name == selected:
+            importlib.import_module(module).register_parser(subparsers)
+        else:
+            subparsers.add_parser(name, help=help)
 
-    args = parser.parse_args()
-    args.func(args, cfg)
+    return parser
 
 
-def subpackages() -> Iterator[pkgutil.ModuleInfo]:
-    this_dir = Path(__file__).parent
+def selected_subcommand(argv: Optional[Sequence[str]] = None) -> Optional[str]:
+    """The subcommand in the arguments `argv`, sys.argv by default"""
+    if argv is None:
+        argv = sys.argv[1:]
 
-    for mod in pkgutil.walk_packages([str(this_dir)], prefix="genart."):
-        if mod.ispkg:
-            yield mod
+    # The top level only has flags, so the first other argument is the subcommand:
+    return next((arg for arg in argv if not arg.startswith("-")), None)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,12 @@
+import datetime as dt
+from pathlib import Path
+from typing import Any, Dict
+
+
+def output_file(config: Dict[str, Any], name: str, extension: str) -> Path:
+    """
+    The file to write the output of `name` to. Runs with an "output_key" in their
+    config, like batches, are named after it. Others after the current time.
+    """
+    key = config.get("output_key") or dt.datetime.now().isoformat().replace(":", "-")
+    return config["output_dir"] / f"{name}_{key}.{extension}"
@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import List, Tuple
 
 
 def parse_size(size: str) -> Tuple[int, int]:
@@ -15,3 +15,21 @@ def parse_size(size: str) -> Tuple[int, int]:
             return width, width
     except ValueError:
         raise ValueError("Invalid size string")
+
+
+def parse_seeds(seeds: str) -> List[int]:
+    """
+    Parses a seeds string such as '7', '0..999' or '1,5,10..20'
+    into a list of seeds. Ranges include their end.
+    """
+    try:
+        res: List[int] = []
+        for part in seeds.split(","):
+            if ".." in part:
+                start, end = part.split("..", maxsplit=1)
+                res.extend(range(int(start), int(end) + 1))
+            else:
+                res.append(int(part))
+        return res
+    except ValueError:
+        raise ValueError("Invalid seeds string")
@@ -0,0 +1,102 @@
+import struct
+import sys
+import zlib
+from typing import BinaryIO
+
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Filter type of every row: each byte minus the one of the pixel to its left
+SUB_FILTER = 1
+
+
+class PNGWriter:
+    """
+    Writes an 8-bit RGBA PNG row by row, so the image never has to be in memory
+    as a whole.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        width: int,
+        height: int,
+        level: int = 6,
+        chunk_size: int = 2**20,
+    ):
+        self.file = file
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+
+        self.rows_written = 0
+        self._compressor = zlib.compressobj(level)
+        self._pending = bytearray()
+
+        self.file.write(PNG_SIGNATURE)
+        # Bit depth 8, color type 6 (RGBA), default compression, filtering and no interlacing:
+        self._write_chunk(
+            b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+        )
+
+    def __enter__(self) -> "PNGWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def write_rows(self, rows: np.ndarray):
+        """Writes the next (n, width, 4) uint8 RGBA rows"""
+        if rows.shape[1:] != (self.width, 4):
+            raise ValueError(f"Expected rows of {self.width} RGBA pixels")
+        if self.rows_written + len(rows) > self.height:
+            raise ValueError("More rows than the image is high")
+
+        flat = rows.reshape(len(rows), -1)
+        filtered = np.empty((len(rows), flat.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = SUB_FILTER
+        filtered[:, 1:5] = flat[:, :4]
+        np.subtract(flat[:, 4:], flat[:, :-4], out=filtered[:, 5:])
+
+        self._pending += self._compressor.compress(filtered.tobytes())
+        self.rows_written += len(rows)
+        if len(self._pending) >= self.chunk_size:
+            self._write_chunk(b"IDAT", bytes(self._pending))
+            self._pending.clear()
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise ValueError(f"Only {self.rows_written} of {self.height} rows written")
+
+        self._pending += self._compressor.flush()
+        self._write_chunk(b"IDAT", bytes(self._pending))
+        self._pending.clear()
+        self._write_chunk(b"IEND", b"")
+
+    def _write_chunk(self, kind: bytes, data: bytes):
+        self.file.write(struct.pack(">I", len(data)))
+        self.file.write(kind)
+        self.file.write(data)
+        self.file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+
+def argb32_to_rgba(data, width: int, height: int, stride: int) -> np.ndarray:
+    """
+    Converts the buffer of a cairo ARGB32 image, premultiplied and in native byte
+    order, to (height, width, 4) straight RGBA.
+    """
+    pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, stride)
+    pixels = pixels[:, : width * 4].reshape(height, width, 4)
+    order = [2, 1, 0, 3] if sys.byteorder == "little" else [1, 2, 3, 0]
+    rgba = pixels[..., order]
+
+    # Undo the premultiplication, rounding like cairo does:
+    alpha = rgba[..., 3:].astype(np.uint16)
+    partial = (alpha > 0) & (alpha < 255)
+    if partial.any():
+        rgb = rgba[..., :3].astype(np.uint16)
+        unmultiplied = (rgb * 255 + alpha // 2) // np.maximum(alpha, 1)
+        rgba[..., :3] = np.where(partial, unmultiplied, rgb).astype(np.uint8)
+
+    return rgba
@@ -1,9 +1,9 @@
-import datetime as dt
 import logging
 
 import cairo
 from numpy.random import Generator, default_rng
 
+from genart.output import output_file
 from genart.parse import parse_size
 from genart.selene import background, calendar, constellation, cores, misc, mooncycle
 from genart.techniques import circlepacking
@@ -37,10 +37,7 @@ def main(args, config):
     width, height = parse_size(args.size)
     rng = default_rng(args.seed)
 
-    out_file = (
-        config["output_dir"]
-        / f"selene_{dt.datetime.now().isoformat().replace(':', '-')}.svg"
-    )
+    out_file = output_file(config, "selene", "svg")
     surface = cairo.SVGSurface(str(out_file), width, height)
     ctx = cairo.Context(surface)
 
@@ -0,0 +1,209 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+class Simplification(Enum):
+    LINES = "lines"
+    CURVES = "curves"
+
+
+@dataclass
+class TrailPath:
+    """A trail as a path through some of its samples"""
+
+    # The (k + 1, 2) points the path passes through:
+    points: np.ndarray
+    # Indices of those points in the trail's samples:
+    samples: np.ndarray
+    # The (k, 2, 2) control points of the cubic Béziers between them, None for lines:
+    controls: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        """The number of segments"""
+        return len(self.points) - 1
+
+    def segments(self) -> Iterator[Tuple[Optional[List[float]], List[float]]]:
+        """The flat control points and the end point of each segment"""
+        ends = self.points[1:].tolist()
+        if self.controls is None:
+            return zip([None] * len(ends), ends)
+        return zip(self.controls.reshape(-1, 4).tolist(), ends)
+
+    def cubics(self) -> np.ndarray:
+        """The (k, 4, 2) control points of all segments as cubic Béziers"""
+        starts, ends = self.points[:-1], self.points[1:]
+        if self.controls is None:
+            controls = np.stack((starts * 2 + ends, starts + ends * 2), axis=1) / 3
+        else:
+            controls = self.controls
+
+        return np.concatenate(
+            (starts[:, np.newaxis], controls, ends[:, np.newaxis]), axis=1
+        )
+
+
+@dataclass
+class Reduction:
+    """Counts the segments of trails before and after simplification"""
+
+    before: int = 0
+    after: int = 0
+
+    def add(self, before: int, after: int):
+        self.before += before
+        self.after += after
+
+    def __str__(self) -> str:
+        pct = self.after / self.before if self.before else 1.0
+        return f"{self.before} -> {self.after} segments ({pct:.1%})"
+
+
+def sampled_path(trail: np.ndarray) -> TrailPath:
+    """
+    The path through every other sample of `trail`, curving towards the samples in
+    between. This is how trails are drawn without simplification.
+    """
+    end = len(trail) - 1 - (len(trail) - 1) % 2
+    samples = np.arange(0, end + 1, 2)
+    controls = trail[1:end:2]
+
+    return TrailPath(trail[samples], samples, np.stack((controls, controls), axis=1))
+
+
+def simplify(
+    trail: np.ndarray,
+    tolerance: float,
+    simplification: Simplification = Simplification.CURVES,
+) -> TrailPath:
+    """
+    Reduces the (n, 2) samples of `trail` to the fewest segments that stay within
+    `tolerance` of all samples.
+    """
+    if simplification is Simplification.LINES:
+        samples = douglas_peucker(trail, tolerance)
+        return TrailPath(trail[samples], samples)
+
+    samples, controls = fit_curves(trail, tolerance)
+    return TrailPath(trail[samples], samples, controls)
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Indices of the points of the polyline `points` to keep, so that none of the
+    dropped ones is further than `tolerance` from the simplified polyline.
+    """
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        dists = _segment_distances(points[start + 1 : end], points[start], points[end])
+        furthest = int(np.argmax(dists))
+        if dists[furthest] > tolerance:
+            split = start + 1 + furthest
+            keep[split] = True
+            stack.extend(((start, split), (split, end)))
+
+    return np.flatnonzero(keep)
+
+
+def fit_curves(points: np.ndarray, tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fits a smooth chain of cubic Béziers through the polyline `points`, staying
+    within `tolerance` of all of them.
+
+    Returns the indices of the points the curves start and end at, and the (k, 2, 2)
+    control points of the curves.
+    """
+    if len(points) < 2:
+        return np.zeros(len(points), dtype=int), np.empty((0, 2, 2))
+
+    tangents = _tangents(points)
+    samples = [0]
+    controls = []
+
+    # Split at the worst fitted point until all curves fit, from left to right:
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        section = points[start : end + 1]
+        ctrl, error, worst = _fit_cubic(section, tangents[start], -tangents[end])
+
+        if error > tolerance and end - start > 1:
+            split = start + worst
+            stack.extend(((split, end), (start, split)))
+        else:
+            samples.append(end)
+            controls.append(ctrl)
+
+    return np.array(samples), np.array(controls).reshape(-1, 2, 2)
+
+
+def _segment_distances(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    ab = b - a
+    length_sq = ab @ ab
+    if length_sq == 0.0:
+        return np.linalg.norm(points - a, axis=-1)
+
+    t = np.clip((points - a) @ ab / length_sq, 0.0, 1.0)
+    return np.linalg.norm(points - (a + t[:, np.newaxis] * ab), axis=-1)
+
+
+def _tangents(points: np.ndarray) -> np.ndarray:
+    tangents = np.gradient(points, axis=0)
+    lengths = np.linalg.norm(tangents, axis=-1, keepdims=True)
+    return np.divide(tangents, lengths, out=np.zeros_like(tangents), where=lengths > 0)
+
+
+def _bernstein(u: np.ndarray) -> np.ndarray:
+    v = 1.0 - u
+    return np.stack((v**3, 3 * v**2 * u, 3 * v * u**2, u**3), axis=-1)
+
+
+def _fit_cubic(
+    points: np.ndarray, tangent_start: np.ndarray, tangent_end: np.ndarray
+) -> Tuple[np.ndarray, float, int]:
+    """
+    Least-squares fit of a cubic from the first to the last of `points`, leaving
+    along `tangent_start` and arriving against `tangent_end`.
+    Returns the control points, the largest error and the index of its point.
+    """
+    first, last = points[0], points[-1]
+    chord = float(np.linalg.norm(last - first))
+
+    # Chord-length parametrisation:
+    u = np.concatenate(
+        ([0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=-1)))
+    )
+    u = u / u[-1] if u[-1] > 0 else np.linspace(0.0, 1.0, len(points))
+    bases = _bernstein(u)
+
+    a1 = bases[:, 1, np.newaxis] * tangent_start
+    a2 = bases[:, 2, np.newaxis] * tangent_end
+    rest = points - np.outer(bases[:, 0] + bases[:, 1], first)
+    rest -= np.outer(bases[:, 2] + bases[:, 3], last)
+
+    c11, c12, c22 = np.sum(a1 * a1), np.sum(a1 * a2), np.sum(a2 * a2)
+    x1, x2 = np.sum(a1 * rest), np.sum(a2 * rest)
+    det = c11 * c22 - c12 * c12
+    alpha1 = alpha2 = 0.0
+    if abs(det) > 1e-12:
+        alpha1 = (x1 * c22 - x2 * c12) / det
+        alpha2 = (c11 * x2 - c12 * x1) / det
+    if alpha1 < 1e-6 * chord or alpha2 < 1e-6 * chord:
+        # Degenerate fit, fall back to handles of a third of the chord:
+        alpha1 = alpha2 = chord / 3.0
+
+    ctrl = np.stack((first + alpha1 * tangent_start, last + alpha2 * tangent_end))
+    fitted = bases @ np.stack((first, ctrl[0], ctrl[1], last))
+    errors = np.linalg.norm(fitted - points, axis=-1)
+    worst = int(np.argmax(errors))
+
+    return ctrl, float(errors[worst]), worst
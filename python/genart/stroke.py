@@ -0,0 +1,121 @@
+from typing import Callable
+
+import numpy as np
+
+from genart.simplify import TrailPath
+
+
+def variable_width_outline(
+    path: TrailPath,
+    width: Callable[[np.ndarray], np.ndarray],
+    resolution: int = 16,
+) -> np.ndarray:
+    """
+    The outline of `path` stroked with a varying width, as a closed chain of (m, 4, 2)
+    cubic Béziers, to be filled in one go.
+
+    `width` maps positions along the trail, in (fractional) sample indices, to line
+    widths. Curves are split so none covers more than 1/`resolution` of the trail,
+    so the outline follows the width profile.
+    """
+    if not len(path):
+        return np.empty((0, 4, 2))
+
+    cubics, starts, ends = _split(path, resolution)
+    spans = starts[:, np.newaxis] + np.outer(ends - starts, np.linspace(0.0, 1.0, 4))
+    half_widths = width(spans)[..., np.newaxis] / 2
+
+    normals = _joint_normals(cubics)
+    offsets = half_widths * np.stack(
+        (normals[:-1], normals[:-1], normals[1:], normals[1:]), axis=1
+    )
+
+    left = cubics + offsets
+    right = (cubics - offsets)[::-1, ::-1]
+    # Close the outline at the ends of the trail:
+    caps = np.stack(
+        (
+            np.linspace(left[-1, -1], right[0, 0], 4),
+            np.linspace(right[-1, -1], left[0, 0], 4),
+        )
+    )
+
+    return np.concatenate((left, caps[:1], right, caps[1:]))
+
+
+def _split(path: TrailPath, resolution: int):
+    """Splits the curves of `path` evenly, into pieces of at most the maximum span"""
+    cubics = path.cubics()
+    samples = path.samples.astype(float)
+
+    # No need to split finer than the curves through every other sample:
+    max_span = max((samples[-1] - samples[0]) / resolution, 2.0)
+    pieces = np.maximum(np.ceil(np.diff(samples) / max_span), 1).astype(int)
+    if (pieces == 1).all():
+        return cubics, samples[:-1], samples[1:]
+
+    idx = np.repeat(np.arange(len(cubics)), pieces)
+    first = np.cumsum(pieces) - pieces
+    piece = np.arange(len(idx)) - np.repeat(first, pieces)
+    a = piece / pieces[idx]
+    b = (piece + 1) / pieces[idx]
+
+    # Hermite form of the piece between the parameters a and b:
+    cubics = cubics[idx]
+    p_a, p_b = _evaluate(cubics, a), _evaluate(cubics, b)
+    d_a, d_b = _derivative(cubics, a), _derivative(cubics, b)
+    scale = ((b - a) / 3)[:, np.newaxis]
+    split = np.stack((p_a, p_a + d_a * scale, p_b - d_b * scale, p_b), axis=1)
+
+    span = samples[idx + 1] - samples[idx]
+    return split, samples[idx] + a * span, samples[idx] + b * span
+
+
+def _evaluate(cubics: np.ndarray, u: np.ndarray) -> np.ndarray:
+    u = u[:, np.newaxis]
+    v = 1.0 - u
+    return (
+        v**3 * cubics[:, 0]
+        + 3 * v**2 * u * cubics[:, 1]
+        + 3 * v * u**2 * cubics[:, 2]
+        + u**3 * cubics[:, 3]
+    )
+
+
+def _derivative(cubics: np.ndarray, u: np.ndarray) -> np.ndarray:
+    u = u[:, np.newaxis]
+    v = 1.0 - u
+    legs = np.diff(cubics, axis=1)
+    return 3 * (v**2 * legs[:, 0] + 2 * v * u * legs[:, 1] + u**2 * legs[:, 2])
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
+
+
+def _tangent(*legs: np.ndarray) -> np.ndarray:
+    """The first leg that isn't degenerate, for each curve"""
+    res = legs[-1]
+    for leg in legs[-2::-1]:
+        res = np.where(np.linalg.norm(leg, axis=-1, keepdims=True) > 0, leg, res)
+    return _unit(res)
+
+
+def _joint_normals(cubics: np.ndarray) -> np.ndarray:
+    """
+    The (k + 1, 2) unit normals at the ends of the chain of curves. Curves that
+    meet share the normal of their average tangent, so their offsets meet as well.
+    """
+    p0, p1, p2, p3 = cubics.transpose(1, 0, 2)
+    leaving = _tangent(p1 - p0, p2 - p0, p3 - p0)
+    arriving = _tangent(p3 - p2, p3 - p1, p3 - p0)
+
+    joints = _unit(arriving[:-1] + leaving[1:])
+    # Turning back on itself, keep the leaving direction:
+    joints = np.where(
+        np.linalg.norm(joints, axis=-1, keepdims=True) > 0, joints, leaving[1:]
+    )
+
+    tangents = np.concatenate((leaving[:1], joints, arriving[-1:]))
+    return np.stack((-tangents[:, 1], tangents[:, 0]), axis=-1)
@@ -1,4 +1,3 @@
-import datetime as dt
 import logging
 from math import cos, pi, sin, tau
 
@@ -6,11 +5,12 @@ import cairo
 from numpy.random import default_rng
 
 from genart.color import Color
+from genart.output import output_file
 from genart.parse import parse_size
 
 from ._utils import draw_grid
-from .circlepacking import pack
-from .pointillism import Pattern, PointLinearGradient
+from .circlepacking import Backend, Growth, Placement, pack
+from .pointillism import DotRendering, Pattern, PointLinearGradient
 
 log = logging.getLogger(__name__)
 
@@ -29,6 +29,12 @@ def _register_circlepacking_parser(subparsers):
     parser.add_argument("-g", "--grow-rate", type=float, default=5.0)
     parser.add_argument("-m", "--max-circles", type=int, default=1000)
     parser.add_argument("-u", "--unbounded", action="store_true")
+    parser.add_argument("-b", "--backend", type=Backend, default=Backend.PYTHON)
+    parser.add_argument("-p", "--placement", type=Placement, default=Placement.RANDOM)
+    parser.add_argument("--per-frame", type=float, default=1)
+    parser.add_argument("--growth", type=Growth, default=Growth.FRAMES)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--tile-size", type=float, default=1000.0)
     parser.add_argument("--seed", type=int)
 
     parser.set_defaults(func=_circlepacking)
@@ -38,6 +44,9 @@ def _register_pointillism_parser(subparsers):
     parser = subparsers.add_parser("pointillism")
 
     parser.add_argument("-s", "--size", default="500x500")
+    parser.add_argument(
+        "-r", "--rendering", type=DotRendering, default=DotRendering.FILL
+    )
     parser.add_argument("--seed", type=int)
 
     parser.set_defaults(func=_pointillism)
@@ -47,14 +56,24 @@ def _circlepacking(args, config):
     width, height = parse_size(args.size)
     rng = default_rng(args.seed)
 
-    out_file = (
-        config["output_dir"]
-        / f"technique_circlepacking_{dt.datetime.now().isoformat()}.svg"
-    )
+    out_file = output_file(config, "technique_circlepacking", "svg")
     surface = cairo.SVGSurface(str(out_file), width, height)
 
     ctx = cairo.Context(surface)
-    circles = pack(rng, width, height, args.grow_rate, args.max_circles, args.unbounded)
+    circles = pack(
+        rng,
+        width,
+        height,
+        args.grow_rate,
+        args.max_circles,
+        args.unbounded,
+        args.backend,
+        args.placement,
+        args.per_frame,
+        args.growth,
+        args.workers,
+        args.tile_size,
+    )
     for c in circles:
         ctx.arc(*c.pos, c.r, 0, tau)
         ctx.stroke()
@@ -66,10 +85,7 @@ def _pointillism(args, config):
     width, height = parse_size(args.size)
     rng = default_rng(args.seed)
 
-    out_file = (
-        config["output_dir"]
-        / f"technique_pointillism_{dt.datetime.now().isoformat()}.svg"
-    )
+    out_file = output_file(config, "technique_pointillism", "svg")
     surface = cairo.SVGSurface(str(out_file), width, height)
 
     ctx = cairo.Context(surface)
@@ -104,7 +120,9 @@ def _pointillism(args, config):
             # Finally, fill the outer circle:
             ctx.arc(cx, cy, radius, 0, tau)
             grad = PointLinearGradient(
-                [Color(0.0, 0.0, 0.0), Color(1.0, 1.0, 1.0)], pat
+                [Color(0.0, 0.0, 0.0), Color(1.0, 1.0, 1.0)],
+                pat,
+                rendering=args.rendering,
             )
             grad.fill(
                 ctx,
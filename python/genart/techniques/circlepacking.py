@@ -1,21 +1,417 @@
 """Based on https://www.youtube.com/watch?v=QHEQuoIKgNE"""
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass
-from typing import List, Optional
+from enum import Enum
+from functools import partial
+from heapq import heappop, heappush
+from math import ceil, floor, hypot, sqrt
+from typing import (
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import numpy as np
-from numpy.random import Generator
+from numpy.random import Generator, default_rng
 
 from genart.fps import FPSCounter
-from genart.geom import distance
+from genart.geom import distances
 
 
 @dataclass
 class Circle:
-    pos: np.array
+    pos: np.ndarray
     r: float
     growing: bool = True
 
 
+class CircleSet:
+    """
+    Circles stored as a structure of arrays: centres (n, 2), radii (n,) and
+    whether they're still growing. Storage doubles whenever it's full, so
+    adding circles is amortized O(1). Iterating or indexing yields
+    `CircleView`s, which have the same attributes as `Circle`.
+    """
+
+    def __init__(self, capacity: int = 16):
+        self._pos = np.zeros((capacity, 2), dtype=np.float64)
+        self._r = np.zeros(capacity, dtype=np.float64)
+        self._growing = np.zeros(capacity, dtype=bool)
+        self._n = 0
+
+    @property
+    def pos(self) -> np.ndarray:
+        return self._pos[: self._n]
+
+    @property
+    def r(self) -> np.ndarray:
+        return self._r[: self._n]
+
+    @property
+    def growing(self) -> np.ndarray:
+        return self._growing[: self._n]
+
+    @property
+    def capacity(self) -> int:
+        return len(self._r)
+
+    @property
+    def nbytes(self) -> int:
+        return self._pos.nbytes + self._r.nbytes + self._growing.nbytes
+
+    def reserve(self, size: int):
+        """Makes room for at least `size` circles"""
+        if size <= self.capacity:
+            return
+
+        capacity = max(self.capacity, 1)
+        while capacity < size:
+            capacity *= 2
+        self._pos = _resized(self._pos, capacity)
+        self._r = _resized(self._r, capacity)
+        self._growing = _resized(self._growing, capacity)
+
+    def append(self, x: float, y: float, r: float, growing: bool = True) -> int:
+        """Adds a circle and returns its index"""
+        idx = self._n
+        self.reserve(idx + 1)
+        self._pos[idx] = (x, y)
+        self._r[idx] = r
+        self._growing[idx] = growing
+        self._n += 1
+        return idx
+
+    def extend(
+        self, pos: np.ndarray, r: Union[float, np.ndarray], growing: bool = True
+    ) -> range:
+        """Adds circles centred at `pos` and returns their indices"""
+        added = range(self._n, self._n + len(pos))
+        self.reserve(added.stop)
+        self._pos[added.start : added.stop] = pos
+        self._r[added.start : added.stop] = r
+        self._growing[added.start : added.stop] = growing
+        self._n = added.stop
+        return added
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, idx: int) -> "CircleView":
+        if not -self._n <= idx < self._n:
+            raise IndexError(idx)
+        return CircleView(self, idx % self._n)
+
+    def __iter__(self) -> Iterator["CircleView"]:
+        return (CircleView(self, i) for i in range(self._n))
+
+
+class CircleView:
+    """A single circle of a `CircleSet`"""
+
+    __slots__ = ("_circles", "_idx")
+
+    def __init__(self, circles: CircleSet, idx: int):
+        self._circles = circles
+        self._idx = idx
+
+    @property
+    def pos(self) -> np.ndarray:
+        return self._circles.pos[self._idx]
+
+    @property
+    def r(self) -> float:
+        return float(self._circles.r[self._idx])
+
+    @r.setter
+    def r(self, value: float):
+        self._circles.r[self._idx] = value
+
+    @property
+    def growing(self) -> bool:
+        return bool(self._circles.growing[self._idx])
+
+    @growing.setter
+    def growing(self, value: bool):
+        self._circles.growing[self._idx] = value
+
+    def __repr__(self) -> str:
+        return f"CircleView(pos={self.pos!r}, r={self.r!r}, growing={self.growing!r})"
+
+
+def _resized(a: np.ndarray, size: int, fill: float = 0) -> np.ndarray:
+    res = np.full((size,) + a.shape[1:], fill, dtype=a.dtype)
+    res[: len(a)] = a
+    return res
+
+
+class Backend(Enum):
+    # One Circle object per circle, grown one by one:
+    PYTHON = "python"
+    # Contiguous arrays, all growing circles grown in one vectorized step:
+    NUMPY = "numpy"
+
+
+class Placement(Enum):
+    # One candidate centre at a time, like the original algorithm:
+    RANDOM = "random"
+    # Candidate centres drawn and checked in vectorized batches:
+    BATCHED = "batched"
+    # Batched, but only drawn from the parts of the canvas that are still free:
+    RASTER = "raster"
+
+
+class Growth(Enum):
+    # Grow every circle a bit each frame, checking for collisions every time:
+    FRAMES = "frames"
+    # Predict when circles will touch, and only process those events:
+    ANALYTIC = "analytic"
+
+
+# (x0, y0, x1, y1) of a rectangle of the canvas
+Box = Tuple[float, float, float, float]
+
+
+def _centre_bounds(
+    width: float, height: float, radius: float, region: Optional[Box] = None
+) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+    """The lowest and highest centre of a circle of `radius`, within `region`"""
+    low = (radius, radius)
+    high = (width - radius, height - radius)
+    if region is not None:
+        x0, y0, x1, y1 = region
+        low = (max(low[0], x0), max(low[1], y0))
+        high = (min(high[0], x1), min(high[1], y1))
+    return low, high
+
+
+class CircleGrid:
+    """
+    Uniform grid (spatial hash) over circles, keyed by circle index.
+
+    Every circle is registered in all cells its bounding box touches,
+    so two circles that touch or overlap always share at least one cell.
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+
+        self._cells: DefaultDict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._extents: Dict[int, Tuple[int, int, int, int]] = {}
+
+    def _extent(self, x: float, y: float, r: float) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            floor((x - r) / size),
+            floor((y - r) / size),
+            floor((x + r) / size),
+            floor((y + r) / size),
+        )
+
+    def insert(self, idx: int, x: float, y: float, r: float):
+        """
+        Registers circle `idx`, or extends it to the new cells it covers
+        after growing. Circles never move or shrink, so cells are only added.
+        """
+        x0, y0, x1, y1 = extent = self._extent(x, y, r)
+        old = self._extents.get(idx)
+        self._extents[idx] = extent
+
+        for i in range(x0, x1 + 1):
+            for j in range(y0, y1 + 1):
+                if old and old[0] <= i <= old[2] and old[1] <= j <= old[3]:
+                    continue
+                self._cells[(i, j)].append(idx)
+
+    def query(self, x: float, y: float, r: float) -> Set[int]:
+        """Indices of all circles that could touch a circle at (x, y) with radius r"""
+        return self._query_cells(*self._extent(x, y, r))
+
+    def query_box(self, x0: float, y0: float, x1: float, y1: float) -> Set[int]:
+        """Indices of all circles that could touch the box from (x0, y0) to (x1, y1)"""
+        size = self.cell_size
+        return self._query_cells(
+            floor(x0 / size), floor(y0 / size), floor(x1 / size), floor(y1 / size)
+        )
+
+    def _query_cells(self, x0: int, y0: int, x1: int, y1: int) -> Set[int]:
+        cells = self._cells
+        res: Set[int] = set()
+
+        for i in range(x0, x1 + 1):
+            for j in range(y0, y1 + 1):
+                bucket = cells.get((i, j))
+                if bucket:
+                    res.update(bucket)
+
+        return res
+
+
+class CellTable:
+    """
+    Dense (columns x rows x slots) table of circle indices over the canvas,
+    to look up the circles near a whole batch of points at once.
+
+    Circles are registered in every cell within `margin` of their bounding box,
+    so a point closer than `r + margin` to a circle finds it in its own cell.
+    """
+
+    def __init__(self, width: float, height: float, cell_size: float, margin: float):
+        self.cell_size = cell_size
+        self.margin = margin
+        self.shape = (int(width // cell_size) + 1, int(height // cell_size) + 1)
+
+        self.items = np.full((*self.shape, 4), -1, dtype=np.intp)
+        self.counts = np.zeros(self.shape, dtype=np.intp)
+        self._extents: Dict[int, Tuple[int, int, int, int]] = {}
+
+    def _extent(self, x: float, y: float, r: float) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        reach = r + self.margin
+        cols, rows = self.shape
+        return (
+            min(max(floor((x - reach) / size), 0), cols),
+            min(max(floor((y - reach) / size), 0), rows),
+            min(max(floor((x + reach) / size) + 1, 0), cols),
+            min(max(floor((y + reach) / size) + 1, 0), rows),
+        )
+
+    def insert(self, idx: int, x: float, y: float, r: float):
+        """Registers circle `idx`, or extends it to the new cells it covers"""
+        x0, y0, x1, y1 = extent = self._extent(x, y, r)
+        old = self._extents.get(idx)
+        if extent == old:
+            return
+        self._extents[idx] = extent
+
+        new_cells = np.ones((x1 - x0, y1 - y0), dtype=bool)
+        if old:
+            new_cells[old[0] - x0 : old[2] - x0, old[1] - y0 : old[3] - y0] = False
+        ii, jj = np.nonzero(new_cells)
+        ii += x0
+        jj += y0
+
+        slots = self.counts[ii, jj]
+        if len(slots) and slots.max() >= self.items.shape[2]:
+            # Double the number of slots per cell:
+            self.items = np.concatenate([self.items, np.full_like(self.items, -1)], 2)
+
+        self.items[ii, jj, slots] = idx
+        self.counts[ii, jj] += 1
+
+    def overlapping(
+        self, points: np.ndarray, radius: float, pos: np.ndarray, r: np.ndarray
+    ) -> np.ndarray:
+        """
+        Which of the (n, 2) `points` would overlap an existing circle when
+        used as the centre of a circle of `radius` (at most `margin`).
+        """
+        if not len(r):
+            return np.zeros(len(points), dtype=bool)
+
+        cells = (points // self.cell_size).astype(np.intp)
+        cells = np.clip(cells, 0, np.array(self.shape) - 1)
+        near = self.items[cells[:, 0], cells[:, 1]]
+        # Empty slots (-1) are masked out below:
+        near_idx = np.maximum(near, 0)
+
+        delta = points[:, None, :] - pos[near_idx]
+        dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+        hits = (near >= 0) & (dist_sq < (r[near_idx] + radius) ** 2)
+
+        return hits.any(axis=1)
+
+
+class CoverageRaster:
+    """
+    Low resolution raster of where the centre of a new circle of `radius`
+    could still go. A cell is covered once it lies entirely inside an
+    existing circle grown by `radius`, or entirely outside the canvas bounds.
+    """
+
+    def __init__(
+        self,
+        width: float,
+        height: float,
+        radius: float,
+        cell_size: float,
+        region: Optional[Box] = None,
+    ):
+        self.radius = radius
+        self.cell_size = cell_size
+
+        cols = ceil(width / cell_size)
+        rows = ceil(height / cell_size)
+        self.covered = np.zeros((cols, rows), dtype=bool)
+
+        # Centres have to stay within [radius, size - radius], and `region`:
+        (low_x, low_y), (high_x, high_y) = _centre_bounds(width, height, radius, region)
+        xs = np.arange(cols + 1) * cell_size
+        ys = np.arange(rows + 1) * cell_size
+        self.covered[(xs[1:] <= low_x) | (xs[:-1] >= high_x), :] = True
+        self.covered[:, (ys[1:] <= low_y) | (ys[:-1] >= high_y)] = True
+
+        # Flat indices of the free cells, refreshed once enough of them got covered:
+        self._free = np.flatnonzero(~self.covered)
+        self._newly_covered = 0
+
+    @property
+    def free_fraction(self) -> float:
+        return 1.0 - self.covered.mean()
+
+    def cover(self, x: float, y: float, r: float):
+        """Marks the cells that are now fully covered by circle (x, y, r)"""
+        reach = r + self.radius
+        size = self.cell_size
+        cols, rows = self.covered.shape
+        x0 = min(max(floor((x - reach) / size), 0), cols)
+        y0 = min(max(floor((y - reach) / size), 0), rows)
+        x1 = min(max(ceil((x + reach) / size), 0), cols)
+        y1 = min(max(ceil((y + reach) / size), 0), rows)
+
+        # Distance to the farthest corner of every cell:
+        xs = np.arange(x0, x1 + 1) * size - x
+        ys = np.arange(y0, y1 + 1) * size - y
+        far_x = np.maximum(np.abs(xs[:-1]), np.abs(xs[1:]))
+        far_y = np.maximum(np.abs(ys[:-1]), np.abs(ys[1:]))
+        inside = far_x[:, None] ** 2 + far_y[None, :] ** 2 < reach**2
+
+        region = self.covered[x0:x1, y0:y1]
+        self._newly_covered += np.count_nonzero(inside & ~region)
+        region |= inside
+
+    def sample(self, rng: Generator, k: int) -> np.ndarray:
+        """Draws k uniformly random points from the uncovered cells"""
+        if self._newly_covered > 0.05 * len(self._free):
+            self._free = np.flatnonzero(~self.covered)
+            self._newly_covered = 0
+
+        free = self._free
+        if not len(free):
+            return np.empty((0, 2))
+
+        cells = free[rng.integers(len(free), size=k)]
+        # Skip cells that got covered since the last refresh:
+        cells = cells[~self.covered.flat[cells]]
+        cols, rows = np.unravel_index(cells, self.covered.shape)
+        cells = np.column_stack([cols, rows])
+        return (cells + rng.random((len(cells), 2))) * self.cell_size
+
+
+def default_cell_size(
+    width: float, height: float, grow_rate: float, max_circles: int
+) -> float:
+    # Roughly the spacing between circles if they were spread evenly:
+    return max(2.0 * grow_rate, sqrt(width * height / max(max_circles, 1)))
+
+
 def pack(
     rng: Generator,
     width: float,
@@ -23,26 +419,795 @@ def pack(
     grow_rate: float,
     max_eyeballs: int,
     unbounded: bool = False,
-) -> List[Circle]:
-    circles: List[Circle] = []
+    backend: Union[Backend, str] = Backend.PYTHON,
+    placement: Union[Placement, str] = Placement.RANDOM,
+    per_frame: float = 1,
+    growth: Union[Growth, str] = Growth.FRAMES,
+    workers: Optional[int] = None,
+    tile_size: float = 1000.0,
+    region: Optional[Box] = None,
+    obstacles: Optional[CircleSet] = None,
+) -> CircleSet:
+    """
+    Packs up to `max_eyeballs` circles growing by `grow_rate` per frame, placing
+    `per_frame` new ones per frame on average.
+
+    New centres are only placed within `region`, if given, though circles may
+    grow out of it. `obstacles` are circles already on the canvas, which new
+    ones avoid. They don't grow and come first in the result.
+    """
+    if workers is not None:
+        if unbounded or region is not None or obstacles is not None:
+            raise ValueError("Tiled packing is bounded and covers the whole canvas")
+        return _pack_tiled(
+            rng,
+            width,
+            height,
+            grow_rate,
+            max_eyeballs,
+            workers,
+            tile_size,
+            backend=backend,
+            placement=placement,
+            per_frame=per_frame,
+            growth=growth,
+        )
+
+    placement = Placement(placement)
+    args = (
+        rng,
+        width,
+        height,
+        grow_rate,
+        max_eyeballs,
+        unbounded,
+        placement,
+        per_frame,
+        region,
+        obstacles,
+    )
+
+    if Growth(growth) is Growth.ANALYTIC:
+        # Event-driven growth always works on arrays:
+        return _pack_analytic(*args)
+    elif Backend(backend) is Backend.NUMPY:
+        return _pack_numpy(*args)
+    elif placement is not Placement.RANDOM or per_frame > 1:
+        raise ValueError(
+            f"Placement {placement.value} with {per_frame} circle(s) per frame "
+            "requires the numpy backend"
+        )
+
+    circles = CircleSet(max_eyeballs)
+    growing: List[int] = []
+    grid = CircleGrid(default_cell_size(width, height, grow_rate, max_eyeballs))
+    if obstacles is not None:
+        for (x, y), r in zip(obstacles.pos.tolist(), obstacles.r.tolist()):
+            grid.insert(circles.append(x, y, r, growing=False), x, y, r)
+    total = len(circles) + max_eyeballs
 
     fps = FPSCounter()
-    while True and len(circles) < max_eyeballs or any(c.growing for c in circles):
-        if len(circles) < max_eyeballs:
-            new = new_circle(rng, grow_rate, width, height, circles)
-            if not new:
-                return circles
-            circles.append(new)
+    frame = 0
+    while len(circles) < total or growing:
+        if len(circles) < total and _due(frame, per_frame):
+            new = _place_circle(rng, grow_rate, width, height, circles, grid, region)
+            if new is None:
+                break
+            idx = circles.append(new[0], new[1], grow_rate)
+            grid.insert(idx, new[0], new[1], grow_rate)
+            growing.append(idx)
 
-        for circle in circles:
-            if circle.growing:
-                grow_circle(circle, grow_rate, width, height, circles, unbounded)
+        for idx in growing:
+            if _grow_circle(circles, idx, grow_rate, width, height, unbounded, grid):
+                x, y = circles.pos[idx]
+                grid.insert(idx, x, y, circles.r[idx])
 
+        growing = [idx for idx in growing if circles.growing[idx]]
+        frame += 1
         fps.frame_done()
 
     return circles
 
 
+def _due(frame: int, per_frame: float) -> int:
+    """How many circles to place on `frame`, to place `per_frame` on average"""
+    return floor((frame + 1) * per_frame) - floor(frame * per_frame)
+
+
+def _place_circle(
+    rng: Generator,
+    radius: float,
+    width: float,
+    height: float,
+    circles: CircleSet,
+    grid: CircleGrid,
+    region: Optional[Box] = None,
+) -> Optional[Tuple[float, float]]:
+    """`new_circle` on the arrays of a `CircleSet`, returning the position"""
+    pos, r = circles.pos, circles.r
+    low, high = _centre_bounds(width, height, radius, region)
+
+    for _ in range(2001):
+        x = rng.uniform(low[0], high[0])
+        y = rng.uniform(low[1], high[1])
+
+        for i in grid.query(x, y, radius):
+            dx = x - pos[i, 0]
+            dy = y - pos[i, 1]
+            if sqrt(dx * dx + dy * dy) < r[i] + radius:
+                break
+        else:
+            return x, y
+
+    return None
+
+
+def _grow_circle(
+    circles: CircleSet,
+    idx: int,
+    rate: float,
+    width: float,
+    height: float,
+    unbounded: bool,
+    grid: CircleGrid,
+) -> bool:
+    """`grow_circle` on the arrays of a `CircleSet`, returning whether it grew"""
+    pos, r = circles.pos, circles.r
+    x, y = pos[idx]
+    new_radius = r[idx] + rate
+
+    if not unbounded and (
+        x + new_radius >= width
+        or x - new_radius <= 0
+        or y + new_radius >= height
+        or y - new_radius <= 0
+    ):
+        circles.growing[idx] = False
+        return False
+
+    for i in grid.query(x, y, new_radius):
+        if i == idx:
+            continue
+        dx = x - pos[i, 0]
+        dy = y - pos[i, 1]
+        if sqrt(dx * dx + dy * dy) <= new_radius + r[i]:
+            circles.growing[idx] = False
+            return False
+
+    r[idx] = new_radius
+    return True
+
+
+def _pack_tiled(
+    rng: Generator,
+    width: float,
+    height: float,
+    grow_rate: float,
+    max_circles: int,
+    workers: int,
+    tile_size: float,
+    per_frame: float = 1,
+    **options,
+) -> CircleSet:
+    """
+    Packs the canvas in tiles of at most `tile_size`, on `workers` processes.
+
+    Circles are only placed inside their tile, but may grow up to a quarter of
+    a tile into its neighbours, so the seams get covered too. Tiles are packed
+    in two phases, like the squares of a checkerboard: tiles of the second
+    phase are packed around the circles their neighbours left in them.
+    Each tile places its share of `per_frame`, so circles are as crowded as on
+    a single canvas when they grow.
+
+    Only diagonal neighbours are packed in the same phase. Circles overlapping
+    those of an earlier tile in their corners shrink to fit, or are dropped if
+    that leaves them smaller than a new circle. The tiles and their seeds only
+    depend on `rng` and `tile_size`, so the result doesn't depend on the number
+    of workers.
+    """
+    cols = ceil(width / tile_size)
+    rows = ceil(height / tile_size)
+    tile_w = width / cols
+    tile_h = height / rows
+    margin = min(tile_w, tile_h) / 4
+    # (x0, y0, x1, y1) of the tiles, and of the tiles extended by the margin:
+    cores = [
+        (col * tile_w, row * tile_h, (col + 1) * tile_w, (row + 1) * tile_h)
+        for row in range(rows)
+        for col in range(cols)
+    ]
+    boxes = [
+        (
+            max(x0 - margin, 0.0),
+            max(y0 - margin, 0.0),
+            min(x1 + margin, width),
+            min(y1 + margin, height),
+        )
+        for x0, y0, x1, y1 in cores
+    ]
+    phases = [(row + col) % 2 for row in range(rows) for col in range(cols)]
+    seeds = rng.integers(2**63, size=len(boxes)).tolist()
+    # Spread the circles evenly, with the remainder on the first tiles:
+    counts = [
+        max_circles // len(boxes) + (k < max_circles % len(boxes))
+        for k in range(len(boxes))
+    ]
+
+    res = CircleSet(max_circles or 1)
+    grid = CircleGrid(default_cell_size(width, height, grow_rate, max_circles))
+    pack_tile = partial(
+        _pack_tile, grow_rate=grow_rate, per_frame=per_frame / len(boxes), **options
+    )
+
+    with ExitStack() as stack:
+        pool = (
+            stack.enter_context(ProcessPoolExecutor(workers)) if workers > 1 else None
+        )
+        for phase in (0, 1):
+            tiles = [k for k in range(len(boxes)) if phases[k] == phase]
+            obstacles = [_circles_in(res, grid, boxes[k]) for k in tiles]
+            args = (
+                [seeds[k] for k in tiles],
+                [counts[k] for k in tiles],
+                [boxes[k] for k in tiles],
+                [cores[k] for k in tiles],
+                obstacles,
+            )
+            packed = pool.map(pack_tile, *args) if pool else map(pack_tile, *args)
+
+            for k, known, tile in zip(tiles, obstacles, packed):
+                # The obstacles come first, and are already in `res`:
+                pos = tile.pos[len(known) :] + boxes[k][:2]
+                for (x, y), r in zip(pos.tolist(), tile.r[len(known) :].tolist()):
+                    for i in grid.query(x, y, r):
+                        ox, oy = res.pos[i]
+                        r = min(r, hypot(x - ox, y - oy) - res.r[i])
+                    if r < grow_rate:
+                        continue
+
+                    grid.insert(len(res), x, y, r)
+                    res.append(x, y, r, growing=False)
+
+    return res
+
+
+def _circles_in(circles: CircleSet, grid: CircleGrid, box: Box) -> CircleSet:
+    """The circles that could touch `box`, relative to its corner"""
+    x0, y0, x1, y1 = box
+    idx = sorted(grid.query_box(x0, y0, x1, y1))
+    res = CircleSet(len(idx) or 1)
+    res.extend(circles.pos[idx] - (x0, y0), circles.r[idx], growing=False)
+    return res
+
+
+def _pack_tile(
+    seed: int,
+    max_eyeballs: int,
+    box: Box,
+    core: Box,
+    obstacles: CircleSet,
+    **kwargs,
+) -> CircleSet:
+    """Packs `box`, with new centres only in `core`, relative to the box corner"""
+    x0, y0, x1, y1 = box
+    cx0, cy0, cx1, cy1 = core
+    return pack(
+        default_rng(seed),
+        x1 - x0,
+        y1 - y0,
+        max_eyeballs=max_eyeballs,
+        region=(cx0 - x0, cy0 - y0, cx1 - x0, cy1 - y0),
+        obstacles=obstacles,
+        **kwargs,
+    )
+
+
+def _pack_numpy(
+    rng: Generator,
+    width: float,
+    height: float,
+    grow_rate: float,
+    max_circles: int,
+    unbounded: bool = False,
+    placement: Placement = Placement.RANDOM,
+    per_frame: float = 1,
+    region: Optional[Box] = None,
+    obstacles: Optional[CircleSet] = None,
+) -> CircleSet:
+    """
+    Same algorithm as `pack`, but with all circles stored in contiguous arrays.
+    Circles are grown simultaneously instead of one after the other, so the
+    result differs slightly from the Python backend for the same seed.
+    """
+    circles = CircleSet()
+    placer = _Placer(width, height, grow_rate, max_circles, placement, region)
+    if obstacles is not None:
+        for (x, y), r in zip(obstacles.pos.tolist(), obstacles.r.tolist()):
+            i = circles.append(x, y, r, growing=False)
+            placer.register(i, x, y, r)
+            placer.cover(x, y, r)
+    total = len(circles) + max_circles
+
+    fps = FPSCounter()
+    frame = 0
+    while len(circles) < total or circles.growing.any():
+        count = min(_due(frame, per_frame), total - len(circles))
+        if count > 0:
+            new = placer.place(rng, circles, count)
+            if not len(new):
+                break
+
+            added = circles.extend(new, grow_rate)
+            for i, (x, y) in zip(added, new.tolist()):
+                placer.register(i, x, y, grow_rate)
+                placer.cover(x, y, grow_rate)
+
+        pos, r, growing = circles.pos, circles.r, circles.growing
+        grown, stopped = _grow_step(
+            pos,
+            r,
+            growing,
+            len(circles),
+            grow_rate,
+            width,
+            height,
+            unbounded,
+            placer.grid,
+        )
+        for i in grown.tolist():
+            placer.register(i, pos[i, 0], pos[i, 1], r[i])
+        # Growing circles are only covered once they reached their final size:
+        for i in stopped.tolist():
+            placer.cover(pos[i, 0], pos[i, 1], r[i])
+        frame += 1
+        fps.frame_done()
+
+    return circles
+
+
+def _pack_analytic(
+    rng: Generator,
+    width: float,
+    height: float,
+    grow_rate: float,
+    max_circles: int,
+    unbounded: bool = False,
+    placement: Placement = Placement.RANDOM,
+    per_frame: float = 1,
+    region: Optional[Box] = None,
+    obstacles: Optional[CircleSet] = None,
+) -> CircleSet:
+    """
+    Event-driven version of the frame-by-frame packing.
+
+    New circles still appear frame after frame, and all circles grow at
+    `grow_rate` per frame until they touch something. But instead of checking
+    every growing circle every frame, it predicts when circles will touch a
+    wall or each other and only processes those events, in order.
+    Circles end up exactly touching, and once all circles are placed,
+    the remaining growth is resolved without any more frames.
+    """
+    placer = _Placer(width, height, grow_rate, max_circles, placement, region)
+    events = _GrowthEvents(width, height, grow_rate, max_circles, unbounded, placer)
+    if obstacles is not None:
+        for (x, y), r in zip(obstacles.pos.tolist(), obstacles.r.tolist()):
+            events.add_stopped(x, y, r)
+    total = len(events.circles) + max_circles
+
+    fps = FPSCounter()
+    frame = 0
+    while len(events.circles) < total:
+        events.resolve(frame)
+        events.grow(frame)
+
+        count = min(_due(frame, per_frame), total - len(events.circles))
+        if count > 0:
+            new = placer.place(rng, events.circles, count)
+            if not len(new):
+                break
+            for x, y in new:
+                events.add(x, y, frame)
+
+        frame += 1
+        fps.frame_done()
+
+    events.resolve(np.inf)
+    # Without walls, a lone circle has nothing to run into:
+    for i in list(events.alive):
+        events.stop(i, frame)
+
+    return events.circles
+
+
+class _GrowthEvents:
+    """
+    Circles growing linearly from their birth frame, with a queue of the
+    moments they will touch a wall or another circle.
+    """
+
+    def __init__(
+        self,
+        width: float,
+        height: float,
+        grow_rate: float,
+        max_circles: int,
+        unbounded: bool,
+        placer: "_Placer",
+    ):
+        self.width = width
+        self.height = height
+        self.grow_rate = grow_rate
+        self.unbounded = unbounded
+        self.placer = placer
+
+        self.circles = CircleSet()
+        self.birth = np.zeros(self.circles.capacity)
+        # Radius each circle is sure to stop at, at the latest:
+        self.cap = np.full(self.circles.capacity, np.inf)
+        self.alive: Set[int] = set()
+        # (time, circle, other circle or -1 for a wall or a stopped circle)
+        self.queue: List[Tuple[float, int, int]] = []
+
+    @property
+    def pos(self) -> np.ndarray:
+        return self.circles.pos
+
+    @property
+    def r(self) -> np.ndarray:
+        return self.circles.r
+
+    @property
+    def growing(self) -> np.ndarray:
+        return self.circles.growing
+
+    def radius_at(self, i: int, time: float) -> float:
+        return self.grow_rate * (time - self.birth[i] + 1)
+
+    def time_at(self, i: int, radius: float) -> float:
+        return self.birth[i] - 1 + radius / self.grow_rate
+
+    def add(self, x: float, y: float, frame: int):
+        i = self.circles.append(x, y, self.grow_rate)
+        self._reserve()
+
+        self.birth[i] = frame
+        self.alive.add(i)
+        self.placer.register(i, x, y, self.grow_rate)
+        self.placer.cover(x, y, self.grow_rate)
+        self.predict(i, frame)
+
+    def add_stopped(self, x: float, y: float, r: float):
+        """Adds a circle that doesn't grow"""
+        i = self.circles.append(x, y, r, growing=False)
+        self._reserve()
+        self.placer.register(i, x, y, r)
+        self.placer.cover(x, y, r)
+
+    def _reserve(self):
+        if len(self.birth) < self.circles.capacity:
+            self.birth = _resized(self.birth, self.circles.capacity)
+            self.cap = _resized(self.cap, self.circles.capacity, np.inf)
+
+    def grow(self, frame: int):
+        """Updates the radius of all growing circles for placing new ones"""
+        for i in self.alive:
+            self.r[i] = self.radius_at(i, frame)
+            self.placer.register(i, self.pos[i, 0], self.pos[i, 1], self.r[i])
+
+    def stop(self, i: int, time: float):
+        self.r[i] = self.radius_at(i, time)
+        self.growing[i] = False
+        self.alive.discard(i)
+        self.placer.register(i, self.pos[i, 0], self.pos[i, 1], self.r[i])
+        self.placer.cover(self.pos[i, 0], self.pos[i, 1], self.r[i])
+
+    def predict(self, i: int, now: float):
+        pos = self.pos
+        x, y = pos[i]
+
+        # Walls and stopped circles don't move, so this event always holds:
+        self.cap[i] = self._first_hit(i)
+        if self.cap[i] < np.inf:
+            heappush(self.queue, (max(now, self.time_at(i, self.cap[i])), i, -1))
+
+        # Two growing circles meet halfway, unless one of them stops first:
+        others = np.fromiter(self.alive, dtype=np.intp, count=len(self.alive))
+        others = others[others != i]
+        dist = distances(pos[others], pos[i])
+        close = dist < self.cap[i] + self.cap[others]
+        for j, d in zip(others[close].tolist(), dist[close].tolist()):
+            meet = (self.time_at(i, d) + self.birth[j] - 1) / 2
+            heappush(self.queue, (max(now, meet), i, j))
+
+    def _first_hit(self, i: int) -> float:
+        """Radius at which circle i touches a wall or a stopped circle"""
+        x, y = self.pos[i]
+        limit = np.inf
+        if not self.unbounded:
+            limit = min(x, self.width - x, y, self.height - y)
+
+        # Look for stopped circles in an ever larger area around the circle:
+        reach = self.placer.grid.cell_size
+        everything = hypot(self.width, self.height)
+        while True:
+            found = self.placer.grid.query(x, y, min(reach, limit))
+            near = np.fromiter(found, dtype=np.intp, count=len(found))
+            near = near[~self.growing[near] & (near != i)]
+            gaps = distances(self.pos[near], self.pos[i]) - self.r[near]
+            hit = min(limit, gaps.min(initial=np.inf))
+            if hit <= reach or reach >= everything:
+                return hit
+            reach *= 2
+
+    def resolve(self, until: float):
+        """Stops all circles touching something before `until`"""
+        growing = self.growing
+        while self.queue and self.queue[0][0] <= until:
+            time, i, j = heappop(self.queue)
+
+            if j < 0:
+                if growing[i]:
+                    self.stop(i, time)
+            elif growing[i] and growing[j]:
+                self.stop(i, time)
+                self.stop(j, time)
+            elif growing[i] or growing[j]:
+                # The other circle stopped before they met, predict again:
+                g, s = (i, j) if growing[i] else (j, i)
+                dist = sqrt(((self.pos[g] - self.pos[s]) ** 2).sum())
+                self.cap[g] = min(self.cap[g], dist - self.r[s])
+                hit = max(time, self.time_at(g, self.cap[g]))
+                heappush(self.queue, (hit, g, -1))
+
+
+class _Placer:
+    """Spatial indexes over the circles, to find room for new ones"""
+
+    def __init__(
+        self,
+        width: float,
+        height: float,
+        radius: float,
+        max_circles: int,
+        placement: Placement,
+        region: Optional[Box] = None,
+    ):
+        self.width = width
+        self.height = height
+        self.radius = radius
+        self.placement = placement
+        self.region = region
+
+        cell_size = default_cell_size(width, height, radius, max_circles)
+        self.grid = CircleGrid(cell_size)
+        self.table = CellTable(width, height, cell_size, radius)
+        self.raster: Optional[CoverageRaster] = None
+        if placement is Placement.RASTER:
+            raster_cell = max(radius, sqrt(width * height / 2**20))
+            self.raster = CoverageRaster(width, height, radius, raster_cell, region)
+
+    def register(self, i: int, x: float, y: float, r: float):
+        """Registers a new circle, or the new size of a grown one"""
+        self.grid.insert(i, x, y, r)
+        if self.placement is not Placement.RANDOM:
+            self.table.insert(i, x, y, r)
+
+    def cover(self, x: float, y: float, r: float):
+        if self.raster is not None:
+            self.raster.cover(x, y, r)
+
+    def place(self, rng: Generator, circles: CircleSet, count: int) -> np.ndarray:
+        """Finds room for up to `count` new circles next to `circles`"""
+        args = (rng, self.radius, self.width, self.height, circles.pos, circles.r)
+
+        if self.raster is not None:
+            return free_positions(
+                *args, self.table, self.raster, count, region=self.region
+            )
+        elif self.placement is Placement.BATCHED:
+            return new_positions(*args, self.table, count, region=self.region)
+        else:
+            return _new_positions(*args, count, self.grid, self.region)
+
+
+def _new_positions(
+    rng: Generator,
+    radius: float,
+    width: float,
+    height: float,
+    pos: np.ndarray,
+    r: np.ndarray,
+    count: int,
+    grid: CircleGrid,
+    region: Optional[Box] = None,
+) -> np.ndarray:
+    """Places up to `count` circles one candidate at a time, like `new_circle`"""
+    low, high = _centre_bounds(width, height, radius, region)
+
+    def overlapping(candidates: np.ndarray) -> np.ndarray:
+        hits = np.zeros(len(candidates), dtype=bool)
+        for i, (x, y) in enumerate(candidates):
+            near = grid.query(x, y, radius)
+            if near:
+                idx = np.fromiter(near, dtype=np.intp, count=len(near))
+                dist = distances(pos[idx], (x, y))
+                hits[i] = (dist < r[idx] + radius).any()
+        return hits
+
+    return _sample_positions(
+        lambda n: rng.uniform(low, high, size=(n, 2)),
+        overlapping,
+        radius,
+        count,
+        batch=1,
+        max_attempts=2001,
+    )
+
+
+def new_positions(
+    rng: Generator,
+    radius: float,
+    width: float,
+    height: float,
+    pos: np.ndarray,
+    r: np.ndarray,
+    table: CellTable,
+    count: int = 1,
+    batch_size: int = 1024,
+    max_attempts: int = 2048,
+    region: Optional[Box] = None,
+) -> np.ndarray:
+    """
+    Finds up to `count` centres for new circles of `radius` that don't overlap
+    the existing circles (`pos`, `r`, registered in `table`) or each other,
+    within `region` if given.
+    """
+    low, high = _centre_bounds(width, height, radius, region)
+
+    return _sample_positions(
+        lambda n: rng.uniform(low, high, size=(n, 2)),
+        lambda candidates: table.overlapping(candidates, radius, pos, r),
+        radius,
+        count,
+        min(batch_size, 16 * count),
+        batch_size,
+        max_attempts,
+    )
+
+
+def free_positions(
+    rng: Generator,
+    radius: float,
+    width: float,
+    height: float,
+    pos: np.ndarray,
+    r: np.ndarray,
+    table: CellTable,
+    raster: CoverageRaster,
+    count: int = 1,
+    batch_size: int = 1024,
+    max_attempts: int = 2048,
+    region: Optional[Box] = None,
+) -> np.ndarray:
+    """
+    Like `new_positions`, but only draws candidates from the cells of `raster`
+    that aren't covered yet, so the success rate doesn't drop as the canvas fills.
+    """
+    low, high = _centre_bounds(width, height, radius, region)
+
+    def overlapping(candidates: np.ndarray) -> np.ndarray:
+        out = (candidates < low).any(axis=1) | (candidates > high).any(axis=1)
+        return out | table.overlapping(candidates, radius, pos, r)
+
+    return _sample_positions(
+        lambda n: raster.sample(rng, n),
+        overlapping,
+        radius,
+        count,
+        min(batch_size, 16 * count),
+        batch_size,
+        max_attempts,
+    )
+
+
+def _sample_positions(
+    draw: Callable[[int], np.ndarray],
+    overlapping: Callable[[np.ndarray], np.ndarray],
+    radius: float,
+    count: int,
+    batch: int,
+    batch_size: int = 1,
+    max_attempts: int = 2048,
+) -> np.ndarray:
+    """
+    Rejection sampling of up to `count` centres for circles of `radius`.
+    `draw(n)` proposes n candidates, and `overlapping(candidates)` tells which
+    of them collide with the existing circles. Candidates are drawn in batches
+    that are checked all at once, starting at `batch` and doubling up to
+    `batch_size` while the canvas is too full to find enough room. They are
+    accepted in the order they were drawn, unless they overlap one accepted
+    before them.
+    """
+    found: List[np.ndarray] = []
+
+    attempts = 0
+    while attempts < max_attempts and len(found) < count:
+        candidates = draw(batch)
+        if not len(candidates):
+            break
+        attempts += len(candidates)
+        batch = min(2 * batch, batch_size)
+
+        for candidate in candidates[~overlapping(candidates)]:
+            if _overlaps_any(candidate, found, 2 * radius):
+                continue
+
+            found.append(candidate)
+            if len(found) == count:
+                break
+
+    return np.array(found, dtype=np.float64).reshape(-1, 2)
+
+
+def _overlaps_any(point: np.ndarray, others: List[np.ndarray], dist: float) -> bool:
+    return any(np.dot(point - o, point - o) < dist * dist for o in others)
+
+
+def _grow_step(
+    pos: np.ndarray,
+    r: np.ndarray,
+    growing: np.ndarray,
+    n: int,
+    rate: float,
+    width: float,
+    height: float,
+    unbounded: bool,
+    grid: CircleGrid,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Grows all growing circles by one step.
+    Returns the indices of the circles that grew, and of those that stopped.
+    """
+    idx = np.flatnonzero(growing[:n])
+    if not len(idx):
+        return idx, idx
+
+    x = pos[idx, 0]
+    y = pos[idx, 1]
+    new_r = r[idx] + rate
+
+    if unbounded:
+        stop = np.zeros(len(idx), dtype=bool)
+    else:
+        stop = (x + new_r >= width) | (x - new_r <= 0) | (y + new_r >= height)
+        stop |= y - new_r <= 0
+
+    # Gather the neighbour candidates of every growing circle as (owner, other)
+    # pairs. Other growing circles might grow this frame too, so look one step further.
+    owners: List[int] = []
+    others: List[int] = []
+    for k, (i, cx, cy, cr) in enumerate(zip(idx.tolist(), x, y, new_r + rate)):
+        near = grid.query(cx, cy, cr)
+        near.discard(i)
+        owners.extend([k] * len(near))
+        others.extend(near)
+
+    if others:
+        owner_idx = np.array(owners, dtype=np.intp)
+        other_idx = np.array(others, dtype=np.intp)
+        # Assume growing neighbours grow as well, so no two circles can grow into each other:
+        other_r = r[other_idx] + rate * growing[other_idx]
+        dist = distances(pos[other_idx], pos[idx[owner_idx]])
+        hits = dist <= new_r[owner_idx] + other_r
+        stop[owner_idx[hits]] = True
+
+    growing[idx[stop]] = False
+    grown = idx[~stop]
+    r[grown] += rate
+
+    return grown, idx[stop]
+
+
 def new_circle(
     rng: Generator,
     radius: float,
@@ -54,11 +1219,14 @@ def new_circle(
     new_circle = Circle(np.array([0.0, 0.0]), radius)
 
     while attempts <= 2000:
-        new_circle.pos[0] = rng.uniform(new_circle.r, width - new_circle.r)
-        new_circle.pos[1] = rng.uniform(new_circle.r, height - new_circle.r)
+        x = rng.uniform(new_circle.r, width - new_circle.r)
+        y = rng.uniform(new_circle.r, height - new_circle.r)
+        new_circle.pos[:] = x, y
 
         for circle in existing_circles:
-            if distance(new_circle.pos, circle.pos) < circle.r + new_circle.r:
+            dx = x - circle.pos[0]
+            dy = y - circle.pos[1]
+            if sqrt(dx * dx + dy * dy) < circle.r + new_circle.r:
                 break
         else:
             return new_circle
@@ -77,13 +1245,14 @@ def grow_circle(
     unbounded: bool = False,
 ):
     new_radius = circle.r + rate
+    x, y = circle.pos
 
     # Check if we go out of bounds:
     if not unbounded and (
-        circle.pos[0] + new_radius >= width
-        or circle.pos[0] - new_radius <= 0
-        or circle.pos[1] + new_radius >= height
-        or circle.pos[1] - new_radius <= 0
+        x + new_radius >= width
+        or x - new_radius <= 0
+        or y + new_radius >= height
+        or y - new_radius <= 0
     ):
         circle.growing = False
         return
@@ -91,7 +1260,9 @@ def grow_circle(
     for c in circles:
         if c is circle:
             continue
-        if distance(circle.pos, c.pos) <= new_radius + c.r:
+        dx = x - c.pos[0]
+        dy = y - c.pos[1]
+        if sqrt(dx * dx + dy * dy) <= new_radius + c.r:
             circle.growing = False
             return
 
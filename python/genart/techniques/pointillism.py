@@ -1,82 +1,100 @@
 from dataclasses import dataclass
 from enum import Enum
-from itertools import cycle
-from math import cos, pi, sin, tau
+from functools import lru_cache
+from math import ceil, cos, hypot, pi, sin, tau
 from typing import Iterator, Sequence, Tuple
 
 import cairo
+import numpy as np
 from numpy.random import Generator
 
 from genart.cairoctx import rotation, source, translation
 from genart.color import Color
-from genart.geom import angle, distance, projected_point_on_line, unit_vector
-from genart.jitter import jitter_points
+from genart.geom import angle, distance, distances, project_points_on_line
+from genart.jitter import jitter_array
 
 Point = Tuple[float, float]
 Circle = Tuple[float, float, float]
 
 
-def _linear_gradient_density(at: Point, start_grad: Point, end_grad: Point) -> float:
-    proj = projected_point_on_line(start_grad, end_grad, at)
-    beyond_grad_start = (
-        unit_vector(start_grad, end_grad) == unit_vector(start_grad, proj)
-    ).all()
-    if not beyond_grad_start:
-        return 1.0
+def _linear_gradient_densities(
+    at: np.ndarray, start_grad: Point, end_grad: Point
+) -> np.ndarray:
+    # How far along the gradient control vector each point is, from 0 to 1:
+    proj = project_points_on_line(start_grad, end_grad, at)
+    pct_along_gcv = distances(proj, start_grad) / distance(start_grad, end_grad)
+    # Points projected before the start of the gradient are fully dense:
+    ahead = (proj - start_grad) @ np.subtract(end_grad, start_grad) > 0.0
 
-    pct_along_gcv = distance(start_grad, proj) / distance(start_grad, end_grad)
-    if pct_along_gcv > 1.0:
-        return 0.0
-    else:
-        return 1.0 - pct_along_gcv
+    return np.where(ahead, np.clip(1.0 - pct_along_gcv, 0.0, 1.0), 1.0)
 
 
-def fill_orthogonal(
+def _thin_rows(
+    rng: Generator,
+    xs: np.ndarray,
+    ys: np.ndarray,
+    start_grad: Point,
+    end_grad: Point,
+    dot_r: float,
+) -> np.ndarray:
+    """
+    Keeps the dots of a grid with x positions `xs` (rows, cols) and row heights
+    `ys` (rows,) with a probability following the gradient, as an (n, 3) array.
+    """
+    rows = np.column_stack((np.zeros_like(ys), ys))
+    density = _linear_gradient_densities(rows, start_grad, end_grad)
+    keep = rng.random(xs.shape) <= density[:, None]
+
+    return np.column_stack(
+        (
+            xs[keep],
+            np.broadcast_to(ys[:, None], xs.shape)[keep],
+            np.full(keep.sum(), dot_r),
+        )
+    )
+
+
+def fill_orthogonal_array(
     rng: Generator,
     start_bound: Point,
     end_bound: Point,
     start_grad: Point,
     end_grad: Point,
     dot_r: float,
-) -> Iterator[Circle]:
+) -> np.ndarray:
     rows = int((end_bound[1] - start_bound[1]) // (2 * dot_r))
     cols = int((end_bound[0] - start_bound[0]) // (2 * dot_r))
 
-    for row in range(rows + 1):
-        cy = start_bound[1] + (row * 2 * dot_r)
-        density = _linear_gradient_density((0.0, cy), start_grad, end_grad)
+    ys = start_bound[1] + np.arange(rows + 1) * 2 * dot_r
+    xs = start_bound[0] + np.arange(cols + 1) * 2 * dot_r
+    xs = np.broadcast_to(xs, (rows + 1, cols + 1))
 
-        for col in range(cols + 1):
-            if rng.random() > density:
-                continue
+    return _thin_rows(rng, xs, ys, start_grad, end_grad, dot_r)
 
-            cx = start_bound[0] + (col * 2 * dot_r)
-            yield (cx, cy, dot_r)
 
-
-def fill_orthogonal_jitter(
-    rng,
+def fill_orthogonal_jitter_array(
+    rng: Generator,
     start_bound: Point,
     end_bound: Point,
     start_grad: Point,
     end_grad: Point,
     dot_r: float,
-) -> Iterator[Circle]:
-    yield from jitter_points(
-        fill_orthogonal(rng, start_bound, end_bound, start_grad, end_grad, dot_r),
+) -> np.ndarray:
+    return jitter_array(
+        fill_orthogonal_array(rng, start_bound, end_bound, start_grad, end_grad, dot_r),
         rng,
         (dot_r / 3.0, dot_r / 3.0, dot_r / 5.0),
     )
 
 
-def fill_packed(
+def fill_packed_array(
     rng: Generator,
     start_bound: Point,
     end_bound: Point,
     start_grad: Point,
     end_grad: Point,
     dot_r: float,
-) -> Iterator[Circle]:
+) -> np.ndarray:
     # A hexagonal pattern is the most closely packed arrangement of circles.
     # So a hexagon with side r describes the centers of 7 circles
     hex_side = 2 * dot_r
@@ -86,16 +104,66 @@ def fill_packed(
     rows = int((end_bound[1] - start_bound[1]) // rowheight)
     cols = int((end_bound[0] - start_bound[0]) // colwidth)
 
-    for row, stagger in zip(range(rows + 1), cycle((0, stagger_x))):
-        cy = start_bound[1] + (row * rowheight)
-        density = _linear_gradient_density((0.0, cy), start_grad, end_grad)
+    ys = start_bound[1] + np.arange(rows + 1) * rowheight
+    stagger = np.where(np.arange(rows + 1) % 2, stagger_x, 0.0)
+    xs = start_bound[0] + np.arange(cols + 1) * colwidth + stagger[:, None]
 
-        for col in range(cols + 1):
-            if rng.random() > density:
-                continue
+    return _thin_rows(rng, xs, ys, start_grad, end_grad, dot_r)
 
-            cx = start_bound[0] + (col * colwidth) + stagger
-            yield (cx, cy, dot_r)
+
+def fill_packed_jitter_array(
+    rng: Generator,
+    start_bound: Point,
+    end_bound: Point,
+    start_grad: Point,
+    end_grad: Point,
+    dot_r: float,
+) -> np.ndarray:
+    return jitter_array(
+        fill_packed_array(rng, start_bound, end_bound, start_grad, end_grad, dot_r),
+        rng,
+        (dot_r / 4.0, dot_r / 4.0, dot_r / 5.0),
+    )
+
+
+def fill_orthogonal(
+    rng: Generator,
+    start_bound: Point,
+    end_bound: Point,
+    start_grad: Point,
+    end_grad: Point,
+    dot_r: float,
+) -> Iterator[Circle]:
+    dots = fill_orthogonal_array(
+        rng, start_bound, end_bound, start_grad, end_grad, dot_r
+    )
+    yield from map(tuple, dots.tolist())
+
+
+def fill_orthogonal_jitter(
+    rng,
+    start_bound: Point,
+    end_bound: Point,
+    start_grad: Point,
+    end_grad: Point,
+    dot_r: float,
+) -> Iterator[Circle]:
+    dots = fill_orthogonal_jitter_array(
+        rng, start_bound, end_bound, start_grad, end_grad, dot_r
+    )
+    yield from map(tuple, dots.tolist())
+
+
+def fill_packed(
+    rng: Generator,
+    start_bound: Point,
+    end_bound: Point,
+    start_grad: Point,
+    end_grad: Point,
+    dot_r: float,
+) -> Iterator[Circle]:
+    dots = fill_packed_array(rng, start_bound, end_bound, start_grad, end_grad, dot_r)
+    yield from map(tuple, dots.tolist())
 
 
 def fill_packed_jitter(
@@ -106,11 +174,10 @@ def fill_packed_jitter(
     end_grad: Point,
     dot_r: float,
 ) -> Iterator[Circle]:
-    yield from jitter_points(
-        fill_packed(rng, start_bound, end_bound, start_grad, end_grad, dot_r),
-        rng,
-        (dot_r / 4.0, dot_r / 4.0, dot_r / 5.0),
+    dots = fill_packed_jitter_array(
+        rng, start_bound, end_bound, start_grad, end_grad, dot_r
     )
+    yield from map(tuple, dots.tolist())
 
 
 class Pattern(Enum):
@@ -124,12 +191,78 @@ class Pattern(Enum):
         funcname = self.value
         return globals()[funcname]
 
+    @property
+    def array_func(self):
+        """Like `func`, but returns all dots at once as an (n, 3) array"""
+        funcname = f"{self.value}_array"
+        return globals()[funcname]
+
+
+class DotRendering(Enum):
+    # An arc and a fill per dot:
+    FILL = "fill"
+    # All dots in a single path, filled at once. Overlapping dots don't add up:
+    PATH = "path"
+    # One dot rendered to a small image once, painted at every dot:
+    STAMP = "stamp"
+
+
+@lru_cache(maxsize=32)
+def _dot_stamp(
+    radius: float, rgba: Tuple[float, float, float, float]
+) -> cairo.ImageSurface:
+    # Leave a pixel of margin for antialiasing:
+    size = ceil(2 * radius) + 2
+    stamp = cairo.ImageSurface(cairo.Format.ARGB32, size, size)
+
+    ctx = cairo.Context(stamp)
+    ctx.set_source_rgba(*rgba)
+    ctx.arc(size / 2, size / 2, radius, 0, tau)
+    ctx.fill()
+
+    return stamp
+
+
+def _fill_dots(ctx: cairo.Context, dots: np.ndarray):
+    for cx, cy, cr in dots.tolist():
+        ctx.arc(cx, cy, cr, 0, tau)
+        ctx.fill()
+
+
+def _fill_dots_path(ctx: cairo.Context, dots: np.ndarray):
+    for cx, cy, cr in dots.tolist():
+        ctx.new_sub_path()
+        ctx.arc(cx, cy, cr, 0, tau)
+    ctx.fill()
+
+
+def _stamp_dots(ctx: cairo.Context, dots: np.ndarray, color: Color, dot_r: float):
+    # Render the stamp at the resolution it ends up with on the target surface:
+    px_per_unit = hypot(*ctx.user_to_device_distance(1.0, 0.0))
+    radius = round(4 * dot_r * px_per_unit) / 4
+    stamp = _dot_stamp(radius, (color.r, color.g, color.b, color.a))
+    half = stamp.get_width() / 2
+    pattern = cairo.SurfacePattern(stamp)
+
+    with source(ctx, pattern):
+        for cx, cy, cr in dots.tolist():
+            # Map the stamp onto the dot, scaled to the (possibly jittered) radius:
+            scale = radius / cr
+            pattern.set_matrix(
+                cairo.Matrix(scale, 0, 0, scale, half - scale * cx, half - scale * cy)
+            )
+            ctx.rectangle(
+                cx - half / scale, cy - half / scale, 2 * half / scale, 2 * half / scale
+            )
+            ctx.fill()
+
 
 @dataclass
 class PointLinearGradient:
     stops: Sequence[Color]
     pattern: Pattern = Pattern.ORTHO
     dot_radius: float = 3.0
+    rendering: DotRendering = DotRendering.FILL
 
     def fill(
         self,
@@ -155,13 +288,17 @@ class PointLinearGradient:
             start_x, start_y, end_x, end_y = ctx.fill_extents()
             ctx.new_path()
 
-            for cx, cy, cr in self.pattern.func(
+            dots = self.pattern.array_func(
                 rng,
                 (start_x, start_y),
                 (end_x, end_y),
                 (0, 0),
                 (0, grad_control_y),
                 self.dot_radius,
-            ):
-                ctx.arc(cx, cy, cr, 0, tau)
-                ctx.fill()
+            )
+            if self.rendering is DotRendering.PATH:
+                _fill_dots_path(ctx, dots)
+            elif self.rendering is DotRendering.STAMP:
+                _stamp_dots(ctx, dots, self.stops[0], self.dot_radius)
+            else:
+                _fill_dots(ctx, dots)
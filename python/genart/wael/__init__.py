@@ -1,14 +1,17 @@
-import datetime as dt
 import logging
+import math
 
 import cairo
 from numpy.random import default_rng
 
+from genart.output import output_file
 from genart.parse import parse_size
-from genart.techniques.circlepacking import pack
+from genart.techniques.circlepacking import Backend, Growth, Placement, pack
 
 from . import generator, models
 from .palette import FLESH_COLOR
+from .sprites import EyeSprites
+from .tiles import Scene, paint, write_png
 
 log = logging.getLogger(__name__)
 
@@ -19,6 +22,35 @@ def register_parser(subparsers):
     parser.add_argument("-s", "--size", default="500x500")
     parser.add_argument("-g", "--grow-rate", type=float, default=5.0)
     parser.add_argument("-m", "--max-eyeballs", type=int, default=1000)
+    parser.add_argument("-b", "--backend", type=Backend, default=Backend.PYTHON)
+    parser.add_argument("-p", "--placement", type=Placement, default=Placement.RANDOM)
+    parser.add_argument("--per-frame", type=float, default=1)
+    parser.add_argument("--growth", type=Growth, default=Growth.FRAMES)
+    parser.add_argument(
+        "--pack-workers",
+        type=int,
+        help="Processes packing the canvas in tiles (changes the composition)",
+    )
+    parser.add_argument("--tile-size", type=float, default=1000.0)
+    parser.add_argument(
+        "--sprites", action="store_true", help="Draw eyes from pre-rendered sprites"
+    )
+    parser.add_argument("--sprite-cache", type=int, default=64, help="Size in MiB")
+    parser.add_argument(
+        "--sprite-quantum", type=float, default=0.5, help="Sprite precision in px"
+    )
+    parser.add_argument(
+        "--render-tile-size",
+        type=int,
+        help="Render in tiles of this many px, streaming them to the PNG",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes drawing the eyes, without changing the image",
+    )
     parser.add_argument("--seed", type=int)
 
     parser.set_defaults(func=main)
@@ -28,19 +60,53 @@ def main(args, config):
     width, height = parse_size(args.size)
     rng = default_rng(args.seed)
 
-    out_file = (
-        config["output_dir"]
-        / f"wael_{dt.datetime.now().isoformat().replace(':', '-')}.png"
-    )
-    surface = cairo.ImageSurface(cairo.Format.ARGB32, width, height)
-    context = cairo.Context(surface)
+    out_file = output_file(config, "wael", "png")
 
-    circles = pack(rng, width, height, args.grow_rate, args.max_eyeballs)
-    eyes = [generator.random_eye(rng, c.pos, c.r) for c in circles]
+    circles = pack(
+        rng,
+        width,
+        height,
+        args.grow_rate,
+        args.max_eyeballs,
+        backend=args.backend,
+        placement=args.placement,
+        per_frame=args.per_frame,
+        growth=args.growth,
+        workers=args.pack_workers,
+        tile_size=args.tile_size,
+    )
+    eyes = generator.random_eyes(rng, circles.pos, circles.r)
     flesh = models.Flesh(FLESH_COLOR)
+    sprites = (
+        EyeSprites(args.sprite_quantum, args.sprite_cache * 2**20)
+        if args.sprites
+        else None
+    )
 
-    flesh.draw(context)
-    for eye in eyes:
-        eye.draw(context)
+    if args.render_tile_size:
+        tile_size = args.render_tile_size
+        scene = Scene(flesh, eyes, tile_size / 4, sprites)
+        with open(out_file, "wb") as f:
+            write_png(f, scene, width, height, tile_size, args.workers)
+        if sprites is not None and args.workers == 1:
+            log.info("Eye sprites: %s", sprites)
+        return
+
+    surface = cairo.ImageSurface(cairo.Format.ARGB32, width, height)
+    if args.workers > 1:
+        # A few bands per worker, to even out their load:
+        band_height = math.ceil(height / (4 * args.workers))
+        scene = Scene(flesh, eyes, band_height / 4, sprites)
+        paint(surface, scene, args.workers, band_height)
+    else:
+        context = cairo.Context(surface)
+        flesh.draw(context)
+        for eye in eyes:
+            if sprites is not None:
+                sprites.draw(context, eye)
+            else:
+                eye.draw(context)
+        if sprites is not None:
+            log.info("Eye sprites: %s", sprites)
 
     surface.write_to_png(out_file)
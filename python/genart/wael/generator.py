@@ -23,6 +23,53 @@ def random_eye(rng: Generator, pos: np.ndarray, size: float) -> models.Eye:
     return models.Eye(pos, size, color_, pupil, iris, eyelids, rotation)
 
 
+def random_eyes(
+    rng: Generator, positions: np.ndarray, sizes: np.ndarray
+) -> models.EyeSet:
+    """
+    Eyes at `positions` with `sizes`, distributed like `random_eye`'s, with each
+    random parameter drawn for all of them at once.
+    """
+    n = len(sizes)
+    sizes = np.asarray(sizes, dtype=np.float64)
+
+    has_iris = rng.random(n) > 0.5
+    iris_size = rng.triangular(sizes / 2.0, 0.75 * sizes, sizes)
+    max_pupil_size = np.where(has_iris, iris_size, sizes)
+
+    pupil_class = rng.integers(len(PUPIL_CHOICES), size=n)
+    slit = np.array([cls is models.SlitPupil for cls in PUPIL_CHOICES])[pupil_class]
+    max_size = np.where(slit, max_pupil_size, 0.8 * max_pupil_size)
+    # Round pupils are at least 1px, unless their eye is too small to fit them:
+    min_size = np.where(slit | (max_size <= 1.0), 0.5 * max_size, 1.0)
+    pupil_size = rng.triangular(min_size, (min_size + max_size) / 2, max_size)
+    pupil_width = 1.0 + rng.random(n) * (pupil_size - 1.0)
+
+    rotation = rng.uniform(0.0, math.pi, n)
+
+    has_eyelids = rng.random(n) > 0.75
+    eyelids_size = sizes + rng.uniform(0.0, 0.5 * sizes)
+    eyelids_opening = rng.uniform(0.5 * sizes, sizes)
+
+    return models.EyeSet(
+        pos=np.asarray(positions, dtype=np.float64),
+        size=sizes,
+        rotation=rotation,
+        pupil_classes=PUPIL_CHOICES,
+        pupil_class=pupil_class,
+        pupil_size=pupil_size,
+        pupil_width=pupil_width,
+        has_iris=has_iris,
+        iris_size=iris_size,
+        iris_stops=rng.random((n, 2, 3)),
+        has_eyelids=has_eyelids,
+        eyelids_size=eyelids_size,
+        eyelids_opening=eyelids_opening,
+        color=color.Color(1, 1, 1),
+        eyelids_color=palette.FLESH_COLOR,
+    )
+
+
 def random_pupil(rng: Generator, pos: np.ndarray, max_size: float) -> models.Pupil:
     cls = rng.choice(PUPIL_CHOICES)
     flds = {f.name for f in fields(cls)}
@@ -1,6 +1,6 @@
 import math
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, Optional
 
 import cairo
 import numpy as np
@@ -21,7 +21,7 @@ class Flesh:
 
 @dataclass
 class Eyelids:
-    pos: np.array
+    pos: np.ndarray
     size: float
     opening: float
     color: color.Color
@@ -74,7 +74,7 @@ class Eyelids:
 
 @dataclass
 class Pupil:
-    pos: np.array
+    pos: np.ndarray
     size: float
 
     def draw(self, ctx: cairo.Context, relative_to=(0, 0)):
@@ -86,7 +86,7 @@ class Pupil:
 
 @dataclass
 class SlitPupil(Pupil):
-    width: int
+    width: float
 
     def draw(self, ctx: cairo.Context, relative_to=(0, 0)):
         pos = self.pos - relative_to
@@ -115,7 +115,7 @@ class SlitPupil(Pupil):
 
 @dataclass
 class Iris:
-    pos: np.array
+    pos: np.ndarray
     size: float
     color: color.RadialGradient
 
@@ -130,7 +130,7 @@ class Iris:
 
 @dataclass
 class Eye:
-    pos: np.array
+    pos: np.ndarray
     size: float
     color: color.Color
     pupil: Pupil
@@ -152,3 +152,72 @@ class Eye:
 
                 if self.eyelids:
                     self.eyelids.draw(ctx, self.size, relative_to=self.pos)
+
+
+@dataclass
+class EyeSet:
+    """
+    Eyes stored as a structure of arrays, one row per eye. Indexing or iterating
+    builds the `Eye`s, so they only exist while they're drawn.
+
+    Pupils are `pupil_classes[pupil_class]`, slit ones `pupil_width` wide. Eyes
+    without iris or eyelids ignore their values for them.
+    """
+
+    pos: np.ndarray
+    size: np.ndarray
+    rotation: np.ndarray
+    pupil_classes: list
+    pupil_class: np.ndarray
+    pupil_size: np.ndarray
+    pupil_width: np.ndarray
+    has_iris: np.ndarray
+    iris_size: np.ndarray
+    # (n, 2, 3) RGB of the inner and outer stops:
+    iris_stops: np.ndarray
+    has_eyelids: np.ndarray
+    eyelids_size: np.ndarray
+    eyelids_opening: np.ndarray
+    color: color.Color
+    eyelids_color: color.Color
+
+    def __len__(self) -> int:
+        return len(self.size)
+
+    def __getitem__(self, idx: int) -> Eye:
+        if not -len(self) <= idx < len(self):
+            raise IndexError(idx)
+
+        pos = self.pos[idx]
+        cls = self.pupil_classes[self.pupil_class[idx]]
+        if issubclass(cls, SlitPupil):
+            pupil = cls(pos, float(self.pupil_size[idx]), float(self.pupil_width[idx]))
+        else:
+            pupil = cls(pos, float(self.pupil_size[idx]))
+
+        iris = None
+        if self.has_iris[idx]:
+            stops = [color.Color(*rgb) for rgb in self.iris_stops[idx].tolist()]
+            iris = Iris(pos, float(self.iris_size[idx]), color.RadialGradient(stops))
+
+        eyelids = None
+        if self.has_eyelids[idx]:
+            eyelids = Eyelids(
+                pos,
+                float(self.eyelids_size[idx]),
+                float(self.eyelids_opening[idx]),
+                self.eyelids_color,
+            )
+
+        return Eye(
+            pos,
+            float(self.size[idx]),
+            self.color,
+            pupil,
+            iris,
+            eyelids,
+            float(self.rotation[idx]),
+        )
+
+    def __iter__(self) -> Iterator[Eye]:
+        return (self[i] for i in range(len(self)))
@@ -0,0 +1,156 @@
+import math
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Hashable
+
+import cairo
+import numpy as np
+
+from genart import color
+from genart.cairoctx import rotation, source, translation
+
+from .models import Eye, SlitPupil
+
+
+class EyeSprites:
+    """
+    Draws eyes from sprites that are rendered once per distinct look.
+
+    Eyes look the same when their dimensions match to `quantum` pixels and their
+    colors to 8 bits per channel. Their sprites are blitted with the position and
+    rotation of each eye. Beyond `max_bytes`, the least recently used sprites are
+    dropped.
+
+    Irises have random colors, so only eyes without one share sprites, about half
+    of wael's. At the default half pixel, which keeps shapes within a quarter
+    pixel, 25-35% of the eyes are blitted; coarser quanta only get closer to half.
+    """
+
+    def __init__(self, quantum: float = 0.5, max_bytes: int = 64 * 2**20):
+        self.quantum = quantum
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._sprites: "OrderedDict[Hashable, cairo.ImageSurface]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.1%}), "
+            f"{len(self)} sprites in {self.nbytes / 2**20:.1f} MiB"
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def draw(self, ctx: cairo.Context, eye: Eye):
+        sprite = self.sprite(eye)
+        half = sprite.get_width() / 2
+
+        pattern = cairo.SurfacePattern(sprite)
+        pattern.set_matrix(cairo.Matrix(x0=half, y0=half))
+
+        with translation(ctx, eye.pos[0], eye.pos[1]):
+            with rotation(ctx, eye.rotation):
+                with source(ctx, pattern):
+                    ctx.rectangle(-half, -half, 2 * half, 2 * half)
+                    ctx.fill()
+
+    def sprite(self, eye: Eye) -> cairo.ImageSurface:
+        """The sprite of the look of `eye`, centered and unrotated"""
+        look = self.look(eye)
+        key = _key(look)
+
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self._sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        sprite = _render(look)
+        self._sprites[key] = sprite
+        self.nbytes += _nbytes(sprite)
+        while self.nbytes > self.max_bytes and len(self._sprites) > 1:
+            _, dropped = self._sprites.popitem(last=False)
+            self.nbytes -= _nbytes(dropped)
+
+        return sprite
+
+    def look(self, eye: Eye) -> Eye:
+        """`eye` with quantized dimensions and colors, at the origin and unrotated"""
+        origin = np.zeros(2)
+
+        pupil = replace(eye.pupil, pos=origin, size=self._quantize(eye.pupil.size))
+        if isinstance(pupil, SlitPupil):
+            pupil.width = self._quantize(pupil.width)
+
+        iris = eye.iris and replace(
+            eye.iris,
+            pos=origin,
+            size=self._quantize(eye.iris.size),
+            color=color.RadialGradient(
+                [_quantize_color(c) for c in eye.iris.color.stops]
+            ),
+        )
+        eyelids = eye.eyelids and replace(
+            eye.eyelids,
+            pos=origin,
+            size=self._quantize(eye.eyelids.size),
+            opening=self._quantize(eye.eyelids.opening),
+            color=_quantize_color(eye.eyelids.color),
+        )
+
+        return replace(
+            eye,
+            pos=origin,
+            size=self._quantize(eye.size),
+            color=_quantize_color(eye.color),
+            pupil=pupil,
+            iris=iris,
+            eyelids=eyelids,
+            rotation=0.0,
+        )
+
+    def _quantize(self, value: float) -> float:
+        return round(value / self.quantum) * self.quantum
+
+
+def _quantize_color(c: color.Color) -> color.Color:
+    return color.Color(*(round(v * 255) / 255 for v in (c.r, c.g, c.b, c.a)))
+
+
+def _key(look: Eye) -> Hashable:
+    pupil = look.pupil
+    return (
+        look.size,
+        look.color,
+        type(pupil),
+        pupil.size,
+        getattr(pupil, "width", None),
+        look.iris and (look.iris.size, look.iris.color),
+        look.eyelids and (look.eyelids.size, look.eyelids.opening, look.eyelids.color),
+    )
+
+
+def _render(look: Eye) -> cairo.ImageSurface:
+    # The eyelids are clipped 1px outside of the eye, leave some room for antialiasing:
+    half = math.ceil(look.size + 2)
+    sprite = cairo.ImageSurface(cairo.Format.ARGB32, 2 * half, 2 * half)
+
+    ctx = cairo.Context(sprite)
+    ctx.translate(half, half)
+    look.draw(ctx)
+    sprite.flush()
+
+    return sprite
+
+
+def _nbytes(sprite: cairo.ImageSurface) -> int:
+    return sprite.get_stride() * sprite.get_height()
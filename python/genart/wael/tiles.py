@@ -0,0 +1,157 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import BinaryIO, Deque, Iterator, List, Optional, Sequence, Tuple
+
+import cairo
+import numpy as np
+
+from genart.png import PNGWriter, argb32_to_rgba
+from genart.techniques.circlepacking import CircleGrid
+
+from .models import Eye, Flesh
+from .sprites import EyeSprites
+
+# Eyelids are clipped 1px outside of their eye, plus some room for antialiasing:
+EYE_MARGIN = 2.0
+
+Tile = Tuple[int, int, int, int]
+
+
+@dataclass
+class Scene:
+    """
+    Everything that is drawn, with an index to find the eyes that touch a tile.
+    Eyes are drawn in order, so overlapping ones look the same in any tile.
+    """
+
+    flesh: Flesh
+    eyes: Sequence[Eye]
+    cell_size: float
+    sprites: Optional[EyeSprites] = None
+    index: CircleGrid = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.index = CircleGrid(self.cell_size)
+        for i, eye in enumerate(self.eyes):
+            self.index.insert(i, eye.pos[0], eye.pos[1], eye.size + EYE_MARGIN)
+
+    def eyes_in(self, x0: float, y0: float, x1: float, y1: float) -> List[Eye]:
+        """The eyes that could touch the box from (x0, y0) to (x1, y1), in order"""
+        return [self.eyes[i] for i in sorted(self.index.query_box(x0, y0, x1, y1))]
+
+    def draw(self, tile: Tile) -> cairo.ImageSurface:
+        """The tile (x0, y0, w, h) of the canvas"""
+        x0, y0, w, h = tile
+        surface = cairo.ImageSurface(cairo.Format.ARGB32, w, h)
+        ctx = cairo.Context(surface)
+        ctx.translate(-x0, -y0)
+
+        self.flesh.draw(ctx)
+        for eye in self.eyes_in(x0, y0, x0 + w, y0 + h):
+            if self.sprites is not None:
+                self.sprites.draw(ctx, eye)
+            else:
+                eye.draw(ctx)
+        surface.flush()
+
+        return surface
+
+    def render(self, tile: Tile) -> np.ndarray:
+        """The (h, w, 4) RGBA pixels of the tile (x0, y0, w, h)"""
+        surface = self.draw(tile)
+        _, _, w, h = tile
+        return argb32_to_rgba(surface.get_data(), w, h, surface.get_stride())
+
+    def rows(self, tile: Tile) -> np.ndarray:
+        """The (h, stride) bytes of the tile (x0, y0, w, h), as cairo stores them"""
+        surface = self.draw(tile)
+        data = np.frombuffer(surface.get_data(), dtype=np.uint8)
+        return data.reshape(tile[3], surface.get_stride()).copy()
+
+
+def bands(width: int, height: int, tile_size: int) -> Iterator[List[Tile]]:
+    """Rows of (x0, y0, w, h) tiles covering the canvas, from top to bottom"""
+    for y0 in range(0, height, tile_size):
+        h = min(tile_size, height - y0)
+        yield [
+            (x0, y0, min(tile_size, width - x0), h) for x0 in range(0, width, tile_size)
+        ]
+
+
+def write_png(
+    file: BinaryIO,
+    scene: Scene,
+    width: int,
+    height: int,
+    tile_size: int = 512,
+    workers: int = 1,
+):
+    """
+    Renders the scene tile by tile into a PNG. PNG rows span the whole canvas, so
+    a band of tiles is kept until it's written: memory grows with the width and
+    the tile size, but not with the height. With several workers, tiles are
+    rendered in parallel with up to two bands per worker in flight.
+    """
+    with PNGWriter(file, width, height) as png:
+        if workers <= 1:
+            for band in bands(width, height, tile_size):
+                png.write_rows(np.concatenate([scene.render(t) for t in band], axis=1))
+            return
+
+        with ProcessPoolExecutor(
+            workers, initializer=_set_scene, initargs=(scene,)
+        ) as pool:
+            pending: Deque[List[Future]] = deque()
+            for band in bands(width, height, tile_size):
+                pending.append([pool.submit(_render, tile) for tile in band])
+                if len(pending) > 2 * workers:
+                    png.write_rows(_gather(pending.popleft()))
+            while pending:
+                png.write_rows(_gather(pending.popleft()))
+
+
+def paint(surface: cairo.ImageSurface, scene: Scene, workers: int, band_height: int):
+    """
+    Draws the scene onto `surface` in full-width bands, rendered on `workers`
+    processes. Bands are offset by whole pixels, so their pixels are the same as
+    drawing the scene onto `surface` directly.
+    """
+    width, height = surface.get_width(), surface.get_height()
+    surface.flush()
+    pixels = np.frombuffer(surface.get_data(), dtype=np.uint8).reshape(
+        height, surface.get_stride()
+    )
+
+    bands = [
+        (0, y0, width, min(band_height, height - y0))
+        for y0 in range(0, height, band_height)
+    ]
+    with ProcessPoolExecutor(
+        workers, initializer=_set_scene, initargs=(scene,)
+    ) as pool:
+        for (_, y0, _, h), rows in zip(bands, pool.map(_rows, bands)):
+            pixels[y0 : y0 + h] = rows
+    surface.mark_dirty()
+
+
+_scene: Optional[Scene] = None
+
+
+def _set_scene(scene: Scene):
+    global _scene
+    _scene = scene
+
+
+def _render(tile: Tile) -> np.ndarray:
+    assert _scene is not None
+    return _scene.render(tile)
+
+
+def _rows(tile: Tile) -> np.ndarray:
+    assert _scene is not None
+    return _scene.rows(tile)
+
+
+def _gather(band: List[Future]) -> np.ndarray:
+    return np.concatenate([future.result() for future in band], axis=1)
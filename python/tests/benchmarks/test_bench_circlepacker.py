@@ -1,5 +1,7 @@
 import random
 
+import pytest
+
 from genart.techniques.circlepacking import pack
 
 
@@ -9,3 +11,57 @@ def test_bench_pack_circles(rng, benchmark):
     benchmark(
         pack, rng=rng, width=1000.0, height=1000.0, grow_rate=1.0, max_eyeballs=100
     )
+
+
+@pytest.mark.parametrize("n_circles", [1_000, 10_000, 50_000])
+def test_bench_pack_circles_scaling(rng, benchmark, n_circles):
+    # Grow the canvas with the circle count to keep the density comparable:
+    side = 30.0 * n_circles**0.5
+
+    benchmark.pedantic(
+        pack,
+        kwargs=dict(
+            rng=rng, width=side, height=side, grow_rate=1.0, max_eyeballs=n_circles
+        ),
+        rounds=3,
+    )
+
+
+def test_bench_pack_circles_numpy(rng, benchmark):
+    benchmark(
+        pack,
+        rng=rng,
+        width=1000.0,
+        height=1000.0,
+        grow_rate=1.0,
+        max_eyeballs=100,
+        backend="numpy",
+    )
+
+
+def test_bench_pack_circles_batched(rng, benchmark):
+    benchmark(
+        pack,
+        rng=rng,
+        width=500.0,
+        height=500.0,
+        grow_rate=1.0,
+        max_eyeballs=2000,
+        backend="numpy",
+        placement="batched",
+        per_frame=8,
+    )
+
+
+@pytest.mark.parametrize("growth", ["frames", "analytic"])
+def test_bench_pack_circles_growth(rng, benchmark, growth):
+    benchmark(
+        pack,
+        rng=rng,
+        width=1000.0,
+        height=1000.0,
+        grow_rate=0.5,
+        max_eyeballs=500,
+        backend="numpy",
+        growth=growth,
+    )
@@ -0,0 +1,62 @@
+import pytest
+
+from genart.bubblechamber import generator as bc_generator
+from genart.bubblechamber.simulation import Simulation as BubbleChamberSimulation
+from genart.cloudscript import generator as cs_generator
+from genart.cloudscript.simulation import Simulation as CloudscriptSimulation
+
+
+@pytest.fixture
+def bubblechamber_sim(rng):
+    chamber = bc_generator.make_chamber(rng)
+    particles = [
+        bc_generator.make_particle(rng, [250.0, 250.0, 0.0], rng.normal(0.0, 50.0, 3))
+        for _ in range(2000)
+    ]
+    for p in particles:
+        p.decays_after = float("inf")
+
+    sim = BubbleChamberSimulation(chamber, particles, rng, dt=0.001)
+    sim.start()
+    return sim
+
+
+@pytest.fixture
+def cloudscript_sim(rng):
+    layout = [list("ABCDEFGH")] * 4
+    chamber = cs_generator.make_superchamber(rng, 1000, 500, layout)
+    particles = cs_generator.generate_particles(rng, chamber)
+    for p in particles:
+        p.decays_after = float("inf")
+
+    sim = CloudscriptSimulation(chamber, particles, dt=0.001)
+    sim.start()
+    return sim
+
+
+def test_bench_bubblechamber_step(bubblechamber_sim, benchmark):
+    benchmark(bubblechamber_sim.step)
+
+
+def test_bench_cloudscript_step(cloudscript_sim, benchmark):
+    benchmark(cloudscript_sim.step)
+
+
+def test_bench_particle_properties(rng, benchmark):
+    particle = bc_generator.make_particle(rng, [0.0, 0.0, 0.0], [1.0, 0.0, 0.0])
+
+    def read():
+        return particle.total_charge * particle.mass
+
+    benchmark(read)
+
+
+def test_bench_cloudscript_chamber_lookup(cloudscript_sim, rng, benchmark):
+    chamber = cloudscript_sim.chamber
+    positions = rng.uniform(-100.0, 1100.0, size=(10_000, 2))
+
+    def lookup():
+        cells = chamber.cells_at(positions)
+        return chamber.magnet_vectors[cells], chamber.frictions[cells]
+
+    benchmark(lookup)
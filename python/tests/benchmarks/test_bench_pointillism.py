@@ -0,0 +1,27 @@
+from math import tau
+
+import cairo
+import pytest
+
+from genart.color import Color
+from genart.techniques.pointillism import DotRendering, Pattern, PointLinearGradient
+
+
+@pytest.mark.parametrize("rendering", list(DotRendering))
+def test_bench_point_linear_gradient_fill(rng, benchmark, rendering):
+    grad = PointLinearGradient(
+        [Color(0.0, 0.0, 0.0), Color(1.0, 1.0, 1.0)],
+        Pattern.PACKED_JITTER,
+        dot_radius=1.5,
+        rendering=rendering,
+    )
+    surface = cairo.ImageSurface(cairo.Format.ARGB32, 1000, 1000)
+    ctx = cairo.Context(surface)
+
+    def fill():
+        ctx.arc(500.0, 500.0, 450.0, 0, tau)
+        ctx.clip_preserve()
+        grad.fill(ctx, rng, 100.0, 100.0, 900.0, 900.0)
+        ctx.reset_clip()
+
+    benchmark(fill)
@@ -0,0 +1,13 @@
+import subprocess
+import sys
+
+
+def test_bench_version_startup(benchmark):
+    benchmark.pedantic(
+        subprocess.run,
+        args=(
+            [sys.executable, "-c", "from genart.main import main; main()", "--version"],
+        ),
+        kwargs=dict(stdout=subprocess.DEVNULL, check=True),
+        rounds=5,
+    )
@@ -0,0 +1,8 @@
+from genart.wael import generator
+
+
+def test_bench_random_eyes(rng, benchmark):
+    positions = rng.uniform(0.0, 1000.0, (100_000, 2))
+    sizes = rng.uniform(5.0, 30.0, 100_000)
+
+    benchmark(generator.random_eyes, rng, positions, sizes)
@@ -13,3 +13,12 @@ def data_dir() -> Path:
 @pytest.fixture()
 def rng():
     return np.random.default_rng()
+
+
+@pytest.fixture
+def real_cairo():
+    """pycairo, for the tests comparing actual pixels"""
+    cairo = pytest.importorskip("cairo")
+    if not isinstance(cairo.ImageSurface, type):
+        pytest.skip("pycairo is not available")
+    return cairo
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Set
+
+import genart
+
+SUBCOMMAND_PACKAGES = (
+    "genart.bubblechamber",
+    "genart.cloudscript",
+    "genart.colorhoney",
+    "genart.selene",
+    "genart.techniques",
+    "genart.wael",
+)
+
+
+def _imported_modules(*argv: str) -> Set[str]:
+    """The modules loaded by running `genart *argv`"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(Path(genart.__file__).parents[1]), env.get("PYTHONPATH", "")]
+    )
+    script = (
+        "import sys\n"
+        "from genart.main import main\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('\\n'.join(sys.modules), file=sys.stderr)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", script] + list(argv),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=env,
+        check=True,
+    )
+    return set(proc.stderr.decode("utf-8").split())
+
+
+def test_version_imports_no_dependencies():
+    res = _imported_modules("--version")
+
+    assert "numpy" not in res
+    assert "cairo" not in res
+    assert not res.intersection(SUBCOMMAND_PACKAGES)
+
+
+def test_subcommand_only_imports_its_own_module():
+    res = _imported_modules("selene", "--help")
+
+    assert "genart.selene" in res
+    # Selene draws with genart.techniques, but none of the other subcommands:
+    for other in ("genart.wael", "genart.bubblechamber", "genart.cloudscript"):
+        assert other not in res
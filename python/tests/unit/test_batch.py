@@ -0,0 +1,117 @@
+import argparse
+import sys
+from pathlib import Path
+
+import pytest
+
+from genart import batch
+from genart.output import output_file
+from genart.parse import parse_seeds
+
+
+def _record(args, config):
+    if args.seed == 13:
+        raise RuntimeError("unlucky")
+    config["runs"].append(
+        (args.seed, args.size, config["output_key"], sys.stdin.read())
+    )
+
+
+@pytest.mark.parametrize(
+    "seeds, expected",
+    [
+        ("7", [7]),
+        ("0..3", [0, 1, 2, 3]),
+        ("1,5,10..12", [1, 5, 10, 11, 12]),
+    ],
+)
+def test_parse_seeds(seeds, expected):
+    assert parse_seeds(seeds) == expected
+
+
+def test_parse_seeds_invalid():
+    with pytest.raises(ValueError):
+        parse_seeds("0..x")
+
+
+def test_output_file_uses_output_key():
+    config = {"output_dir": Path("out"), "output_key": "seed007"}
+
+    res = output_file(config, "wael", "png")
+
+    assert res == Path("out/wael_seed007.png")
+
+
+def test_render_runs_subcommand_per_seed(monkeypatch):
+    monkeypatch.setattr(sys, "stdin", sys.stdin)
+    args = argparse.Namespace(func=_record, seed=None, size="500")
+    runs = []
+
+    res = [
+        batch._render(args, {"runs": runs, "output_key": f"seed{s}"}, s, "text")
+        for s in (3, 13, 4)
+    ]
+
+    assert [item.seed for item in res] == [3, 13, 4]
+    assert res[1].error == "RuntimeError: unlucky"
+    assert runs == [(3, "500", "seed3", "text"), (4, "500", "seed4", "text")]
+    assert args.seed is None
+
+
+def test_summary():
+    items = [
+        batch.BatchItem(0, 1.0),
+        batch.BatchItem(1, 3.0, "RuntimeError: boom"),
+        batch.BatchItem(2, 2.0),
+    ]
+
+    res = batch.summary(items, 4.0)
+
+    assert res.splitlines() == [
+        "3 runs, 1 failed, in 4.00s (0.75 runs/s)",
+        "per run: min 1.00s, median 2.00s, mean 2.00s, max 3.00s",
+        "slowest seeds: 1 (3.00s), 2 (2.00s), 0 (1.00s)",
+        "failed seeds: 1",
+    ]
+
+
+@pytest.mark.parametrize(
+    "argv, jobs",
+    [
+        (["--seeds", "1..3", "wael", "--workers", "4", "--seed", "9"], None),
+        (["--seeds", "1..3", "-j", "2", "wael", "--workers", "4", "--seed", "9"], 2),
+    ],
+)
+def test_subcommand_options_reach_the_subcommand(argv, jobs):
+    from genart.main import build_parser
+
+    args = build_parser(["batch", *argv]).parse_args(["batch", *argv])
+    sub_args, options = batch.parse_command(args.command)
+
+    assert args.seeds == [1, 2, 3]
+    assert args.jobs == jobs
+    assert args.command[0] == "wael"
+    assert (sub_args.workers, sub_args.seed) == (4, 9)
+    assert (options.seeds, options.jobs) == (None, None)
+
+
+@pytest.mark.parametrize(
+    "command, seeds, jobs, workers",
+    [
+        # wael has its own --workers, --seeds is always the batch's:
+        (["wael", "--seeds", "0..2", "--workers", "4"], [0, 1, 2], None, 4),
+        (["wael", "--seeds=0..2", "-j", "2"], [0, 1, 2], 2, 1),
+        # selene has no --workers, so it's the batch's:
+        (["selene", "--seeds", "0..2", "--workers", "3"], [0, 1, 2], 3, None),
+    ],
+)
+def test_batch_options_after_the_subcommand(command, seeds, jobs, workers):
+    sub_args, options = batch.parse_command(command)
+
+    assert (options.seeds, options.jobs) == (seeds, jobs)
+    assert getattr(sub_args, "workers", None) == workers
+
+
+def test_unknown_options_after_the_subcommand():
+    with pytest.raises(SystemExit):
+        batch.parse_command(["selene", "--seeds", "0..2", "--nope"])
@@ -0,0 +1,152 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from genart.bubblechamber import render, simulation
+from genart.bubblechamber.generator import (
+    generate_particles,
+    make_chamber,
+    make_particle,
+)
+from genart.bubblechamber.models import ParticleStore, SplitTree
+from genart.bubblechamber.render import BubbleChamberRenderer, LineWidth, TrailStore
+
+
+def _step(monkeypatch, sim, tdelta):
+    monkeypatch.setattr(simulation, "perf_counter", lambda: sim.clock + tdelta)
+    sim.step()
+
+
+def test_particle_store_extend(rng):
+    store = ParticleStore(capacity=2)
+    particles = [make_particle(rng, [0.0, 0.0, 0.0], [1.0, 0.0, 0.0]) for _ in range(3)]
+
+    added = store.extend(particles)
+
+    assert list(added) == [0, 1, 2]
+    assert len(store) == 3
+    assert store.capacity == 4
+    assert store.mass[:3].tolist() == [p.mass for p in particles]
+    assert store.total_charge[:3].tolist() == [p.total_charge for p in particles]
+    assert store.is_alive[:3].all()
+
+
+def test_simulation_step_moves_particles(monkeypatch, rng):
+    chamber = make_chamber(rng, magnetic_field=2.0, friction=0.5)
+    particle = make_particle(rng, [0.0, 0.0, 0.0], [10.0, 0.0, 0.0], [1, 2], None)
+    particle.decays_after = 100.0
+    sim = simulation.Simulation(chamber, [particle], rng)
+
+    _step(monkeypatch, sim, 0.1)
+
+    # Reference: the Lorentz force, friction and integration of a single particle
+    velocity = np.array([10.0, 0.0, 0.0])
+    velocity += 3 * np.cross(velocity, [0.0, 0.0, 2.0]) / 2 * 0.1
+    velocity *= 1.0 - 0.5 * 0.1
+    np.testing.assert_allclose(sim.particles.velocity[0], velocity)
+    np.testing.assert_allclose(sim.particles.position[0], velocity * 0.1)
+    assert sim.particles.lifetime[0] == 0.1
+
+
+def test_simulation_step_decays_particles(monkeypatch, rng):
+    chamber = make_chamber(rng)
+    pair = SplitTree(2, [SplitTree(1, []), SplitTree(1, [])])
+    tree = SplitTree(3, [SplitTree(1, []), pair])
+    particle = make_particle(rng, [1.0, 2.0, 3.0], [0.0, 0.0, 0.0], [1, -1, 2], tree)
+    particle.decays_after = 0.05
+    sim = simulation.Simulation(chamber, [particle], rng)
+
+    _step(monkeypatch, sim, 0.1)
+
+    ps = sim.particles
+    assert len(ps) == 3
+    assert ps.is_alive[:3].tolist() == [False, True, True]
+    assert ps.mass[1:3].tolist() == [1, 2]
+    assert ps.total_charge[1:3].tolist() == [1, 1]
+    np.testing.assert_array_equal(ps.position[1:3], [[1.0, 2.0, 3.0]] * 2)
+
+
+def test_fixed_timestep_is_reproducible():
+    def run():
+        rng = np.random.default_rng(5)
+        particles = generate_particles(rng, 500, 500, 3)
+        sim = simulation.Simulation(make_chamber(rng), particles, rng, dt=0.01)
+        sim.start()
+        for _ in range(200):
+            sim.step()
+        return sim
+
+    first = run()
+    second = run()
+
+    assert first.time_passed == pytest.approx(2.0)
+    assert len(first.particles) == len(second.particles)
+    np.testing.assert_array_equal(first.particles.position, second.particles.position)
+
+
+def test_trail_store_groups_samples_by_particle():
+    trails = TrailStore(capacity=2)
+    trails.append(np.array([3, 1]), np.array([[0.0, 0.0], [1.0, 1.0]]))
+    trails.append(np.array([1]), np.array([[2.0, 2.0]]))
+    trails.append(np.array([1, 3]), np.array([[3.0, 3.0], [4.0, 4.0]]))
+
+    res = [(idx, points.tolist()) for idx, points in trails.trails()]
+
+    assert len(trails) == 5
+    assert res == [
+        (1, [[1.0, 1.0], [2.0, 2.0], [3.0, 3.0]]),
+        (3, [[0.0, 0.0], [4.0, 4.0]]),
+    ]
+
+
+def test_trail_store_orders_and_pops_trails():
+    trails = TrailStore()
+    trails.append(np.array([0, 2, 1]), np.array([[0.0, 0.0], [2.0, 2.0], [1.0, 1.0]]))
+    trails.append(np.array([2, 0]), np.array([[3.0, 3.0], [4.0, 4.0]]))
+
+    assert [idx for idx, _ in trails.trails(first=[2])] == [2, 0, 1]
+
+    popped = [(idx, points.tolist()) for idx, points in trails.pop_trails([2, 1])]
+
+    assert popped == [(1, [[1.0, 1.0]]), (2, [[2.0, 2.0], [3.0, 3.0]])]
+    assert len(trails) == 2
+    assert [idx for idx, _ in trails.trails()] == [0]
+
+
+@pytest.mark.parametrize("tolerance", [None, 0.5])
+def test_streaming_draws_like_buffering(monkeypatch, tolerance):
+    def draw(streaming):
+        ctx = mock.MagicMock()
+        # Restoring the source must look the same in both runs:
+        ctx.get_source.return_value = mock.sentinel.source
+        monkeypatch.setattr(render.cairo, "Context", lambda surface: ctx)
+
+        rng = np.random.default_rng(11)
+        particles = generate_particles(rng, 500, 500, 4)
+        sim = simulation.Simulation(make_chamber(rng), particles, rng, dt=0.01)
+        renderer = BubbleChamberRenderer(
+            None,
+            rng,
+            500,
+            500,
+            line_width=LineWidth.MASS,
+            streaming=streaming,
+            tolerance=tolerance,
+        )
+
+        sim.start()
+        for _ in range(300):
+            if not sim.particles.is_dirty.any():
+                break
+            sim.step()
+            renderer.render(sim)
+        renderer.finalize(sim)
+
+        return ctx.mock_calls
+
+    buffered = draw(streaming=False)
+    streamed = draw(streaming=True)
+
+    assert any(name == "stroke" for name, _, _ in buffered)
+    assert streamed == buffered
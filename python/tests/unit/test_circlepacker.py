@@ -1,8 +1,20 @@
 import random
 
 import numpy as np
+import pytest
 
-from genart.techniques.circlepacking import Circle, grow_circle, new_circle, pack
+from genart.techniques.circlepacking import (
+    CellTable,
+    Circle,
+    CircleGrid,
+    CircleSet,
+    CoverageRaster,
+    free_positions,
+    grow_circle,
+    new_circle,
+    new_positions,
+    pack,
+)
 
 
 def test_new_circle_on_blank_canvas(rng):
@@ -44,3 +56,289 @@ def test_pack(rng):
     circles = pack(rng, 100.0, 100.0, 1.0, 10)
 
     assert len(circles) == 10
+
+
+def test_circle_grid_finds_touching_circles():
+    grid = CircleGrid(cell_size=10.0)
+    grid.insert(0, 5.0, 5.0, 1.0)
+    grid.insert(1, 50.0, 50.0, 1.0)
+    # Grown circles are extended to the new cells they cover:
+    grid.insert(1, 50.0, 50.0, 46.0)
+
+    assert grid.query(5.0, 5.0, 1.0) == {0, 1}
+    assert grid.query(150.0, 150.0, 1.0) == set()
+
+
+def test_circle_grid_query_box():
+    grid = CircleGrid(cell_size=10.0)
+    grid.insert(0, 5.0, 5.0, 1.0)
+    grid.insert(1, 45.0, 5.0, 1.0)
+
+    assert grid.query_box(0.0, 0.0, 20.0, 20.0) == {0}
+    assert grid.query_box(0.0, 0.0, 49.0, 9.0) == {0, 1}
+    assert grid.query_box(0.0, 30.0, 50.0, 50.0) == set()
+
+
+def test_circle_set_grows_by_doubling():
+    circles = CircleSet(capacity=2)
+    circles.append(1.0, 2.0, 3.0)
+    circles.append(4.0, 5.0, 6.0, growing=False)
+    added = circles.extend(np.array([[7.0, 8.0], [9.0, 10.0], [11.0, 12.0]]), 1.0)
+
+    assert list(added) == [2, 3, 4]
+    assert len(circles) == 5
+    assert circles.capacity == 8
+    np.testing.assert_array_equal(circles.r, [3.0, 6.0, 1.0, 1.0, 1.0])
+    np.testing.assert_array_equal(circles.growing, [1, 0, 1, 1, 1])
+    # Positions, radii and the growing flag take 25 bytes per circle:
+    assert circles.nbytes == 8 * 25
+
+
+def test_circle_set_views():
+    circles = CircleSet()
+    circles.append(1.0, 2.0, 3.0)
+    circles.append(4.0, 5.0, 6.0, growing=False)
+
+    np.testing.assert_array_equal(circles[0].pos, [1.0, 2.0])
+    assert [c.r for c in circles] == [3.0, 6.0]
+    assert circles[-1].growing is False
+
+    circles[0].r = 7.0
+    circles[0].growing = False
+    assert circles.r[0] == 7.0
+    assert not circles.growing.any()
+
+    with pytest.raises(IndexError):
+        circles[2]
+
+
+def test_pack_matches_unindexed_packing():
+    circles = pack(np.random.default_rng(42), 200.0, 200.0, 2.0, 100)
+
+    # Reference: the same algorithm, checking against every circle:
+    rng = np.random.default_rng(42)
+    expected = []
+    while len(expected) < 100 or any(c.growing for c in expected):
+        if len(expected) < 100:
+            new = new_circle(rng, 2.0, 200.0, 200.0, expected)
+            if not new:
+                break
+            expected.append(new)
+        for c in expected:
+            if c.growing:
+                grow_circle(c, 2.0, 200.0, 200.0, expected)
+
+    assert len(circles) == len(expected)
+    for res, exp in zip(circles, expected):
+        np.testing.assert_array_equal(res.pos, exp.pos)
+        assert res.r == exp.r
+
+
+@pytest.mark.parametrize("unbounded", [False, True])
+@pytest.mark.parametrize(
+    "placement, per_frame",
+    [("random", 1), ("random", 4), ("batched", 1), ("batched", 4)],
+)
+def test_pack_numpy_backend(rng, unbounded, placement, per_frame):
+    circles = pack(
+        rng,
+        100.0,
+        100.0,
+        1.0,
+        50,
+        unbounded,
+        backend="numpy",
+        placement=placement,
+        per_frame=per_frame,
+    )
+
+    assert len(circles) == 50
+    pos = np.array([c.pos for c in circles])
+    r = np.array([c.r for c in circles])
+
+    # No two circles overlap:
+    dist = np.linalg.norm(pos[:, None] - pos[None], axis=-1)
+    np.fill_diagonal(dist, np.inf)
+    assert (dist >= r[:, None] + r[None]).all()
+
+    if not unbounded:
+        assert (pos - r[:, None] > 0).all()
+        assert (pos + r[:, None] < 100.0).all()
+
+
+@pytest.mark.parametrize("unbounded", [False, True])
+@pytest.mark.parametrize("placement, per_frame", [("random", 1), ("raster", 4)])
+def test_pack_analytic_growth(rng, unbounded, placement, per_frame):
+    circles = pack(
+        rng,
+        100.0,
+        100.0,
+        1.0,
+        50,
+        unbounded,
+        placement=placement,
+        per_frame=per_frame,
+        growth="analytic",
+    )
+
+    assert len(circles) == 50
+    assert not any(c.growing for c in circles)
+    pos = np.array([c.pos for c in circles])
+    r = np.array([c.r for c in circles])
+
+    # Circles stop exactly when touching, so allow for rounding errors:
+    dist = np.linalg.norm(pos[:, None] - pos[None], axis=-1)
+    np.fill_diagonal(dist, np.inf)
+    assert (dist - r[:, None] - r[None] > -1e-9).all()
+
+    if not unbounded:
+        assert (pos - r[:, None] > -1e-9).all()
+        assert (pos + r[:, None] < 100.0 + 1e-9).all()
+
+
+def test_pack_analytic_growth_fills_more_than_frames():
+    def area(circles):
+        return sum(c.r**2 for c in circles)
+
+    frames = pack(np.random.default_rng(0), 200.0, 200.0, 2.0, 100)
+    analytic = pack(np.random.default_rng(0), 200.0, 200.0, 2.0, 100, growth="analytic")
+
+    # Frame by frame, circles stop up to a whole grow step before touching:
+    assert area(analytic) > area(frames)
+
+
+def test_pack_tiled_is_independent_of_workers():
+    def tiled(workers):
+        rng = np.random.default_rng(7)
+        return pack(rng, 200.0, 150.0, 1.0, 120, workers=workers, tile_size=60.0)
+
+    circles = tiled(1)
+    in_parallel = tiled(3)
+
+    np.testing.assert_array_equal(circles.pos, in_parallel.pos)
+    np.testing.assert_array_equal(circles.r, in_parallel.r)
+
+    # Circles along the seams were shrunk or dropped so none overlap:
+    pos, r = circles.pos, circles.r
+    dist = np.linalg.norm(pos[:, None] - pos[None], axis=-1)
+    np.fill_diagonal(dist, np.inf)
+    assert (dist - r[:, None] - r[None] > -1e-9).all()
+    assert (r >= 1.0).all()
+    assert (pos - r[:, None] > -1e-9).all()
+    assert (pos + r[:, None] < (200.0 + 1e-9, 150.0 + 1e-9)).all()
+
+
+@pytest.mark.parametrize("growth", ["frames", "analytic"])
+def test_pack_tiled_is_as_dense_as_a_single_canvas(growth):
+    def coverage(circles):
+        return np.pi * (circles.r**2).sum() / (600.0 * 600.0)
+
+    args = (600.0, 600.0, 1.0, 1500)
+    single = pack(np.random.default_rng(3), *args, growth=growth)
+    tiled = pack(
+        np.random.default_rng(3), *args, growth=growth, workers=1, tile_size=200.0
+    )
+
+    assert len(tiled) >= 0.98 * len(single)
+    assert coverage(tiled) >= 0.97 * coverage(single)
+
+
+def test_pack_tiled_is_bounded():
+    with pytest.raises(ValueError):
+        pack(np.random.default_rng(0), 100.0, 100.0, 1.0, 10, True, workers=1)
+
+
+def test_pack_places_centres_in_region_around_obstacles(rng):
+    obstacles = CircleSet()
+    obstacles.append(50.0, 50.0, 20.0, growing=False)
+    region = (20.0, 30.0, 80.0, 60.0)
+
+    circles = pack(
+        rng,
+        100.0,
+        100.0,
+        1.0,
+        30,
+        growth="analytic",
+        region=region,
+        obstacles=obstacles,
+    )
+
+    assert len(circles) == 31
+    np.testing.assert_array_equal(circles.pos[0], (50.0, 50.0))
+    assert circles.r[0] == 20.0
+    pos, r = circles.pos[1:], circles.r[1:]
+    assert (pos >= (20.0, 30.0)).all() and (pos <= (80.0, 60.0)).all()
+    assert (np.hypot(*(pos - 50.0).T) - r >= 20.0 - 1e-9).all()
+
+
+def test_pack_tiled_with_fewer_circles_than_tiles():
+    # A lone circle in a tile has nothing else to stop its growth:
+    circles = pack(np.random.default_rng(1), 100.0, 100.0, 1.0, 1, workers=1)
+    assert len(circles) == 1
+
+    circles = pack(
+        np.random.default_rng(1), 200.0, 200.0, 1.0, 3, workers=1, tile_size=50.0
+    )
+    assert 0 < len(circles) <= 3
+    assert (circles.r <= 50.0 * 1.5).all()
+
+
+def test_pack_python_backend_places_one_at_a_time(rng):
+    with pytest.raises(ValueError):
+        pack(rng, 100.0, 100.0, 1.0, 50, placement="batched")
+
+
+def test_new_positions_avoid_existing_circles_and_each_other(rng):
+    pos = np.array([[50.0, 50.0]])
+    r = np.array([30.0])
+    table = CellTable(100.0, 100.0, 10.0, 2.0)
+    table.insert(0, 50.0, 50.0, 30.0)
+
+    res = new_positions(rng, 2.0, 100.0, 100.0, pos, r, table, count=20)
+
+    assert res.shape == (20, 2)
+    assert (np.linalg.norm(res - pos, axis=1) >= 32.0).all()
+    dist = np.linalg.norm(res[:, None] - res[None], axis=-1)
+    np.fill_diagonal(dist, np.inf)
+    assert (dist >= 4.0).all()
+
+
+def test_new_positions_on_full_canvas(rng):
+    pos = np.array([[5.0, 5.0]])
+    r = np.array([10.0])
+    table = CellTable(10.0, 10.0, 2.0, 1.0)
+    table.insert(0, 5.0, 5.0, 10.0)
+
+    res = new_positions(rng, 1.0, 10.0, 10.0, pos, r, table)
+
+    assert len(res) == 0
+
+
+def test_coverage_raster_only_samples_free_cells(rng):
+    raster = CoverageRaster(100.0, 100.0, 5.0, 5.0)
+    # The border cells can't hold a centre:
+    assert raster.covered[0].all() and raster.covered[-1].all()
+
+    # Cover everything but the top-right corner:
+    raster.cover(0.0, 100.0, 125.0)
+    assert 0.0 < raster.free_fraction < 0.1
+
+    points = raster.sample(rng, 100)
+    assert len(points)
+    # Points are at most a cell diagonal inside the covered area:
+    assert (np.linalg.norm(points - (0.0, 100.0), axis=1) >= 130.0 - 7.1).all()
+
+
+def test_free_positions_on_nearly_full_canvas(rng):
+    pos = np.array([[0.0, 100.0]])
+    r = np.array([130.0])
+    table = CellTable(100.0, 100.0, 10.0, 1.0)
+    table.insert(0, 0.0, 100.0, 130.0)
+    raster = CoverageRaster(100.0, 100.0, 1.0, 5.0)
+    raster.cover(0.0, 100.0, 130.0)
+
+    res = free_positions(rng, 1.0, 100.0, 100.0, pos, r, table, raster, count=5)
+
+    assert res.shape == (5, 2)
+    assert (np.linalg.norm(res - pos, axis=1) >= 131.0).all()
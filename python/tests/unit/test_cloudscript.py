@@ -1,9 +1,11 @@
 from uuid import uuid4
 
+import numpy as np
 import pytest
 
 from genart.cloudscript import generator, layout
 from genart.cloudscript.models import BubbleChamber
+from genart.cloudscript.simulation import Simulation
 
 
 def test_generate_superchamber(rng):
@@ -36,6 +38,30 @@ def test_superchamber_get_chamber_at(rng, dims, grid, point, exp_row_col):
     assert res is superchamber.chambers[exp_row_col[0]][exp_row_col[1]]
 
 
+def test_superchamber_outside_is_default_chamber(rng):
+    superchamber = generator.make_superchamber(rng, 100, 100, [list("AB"), list("CD")])
+
+    for point in [(-1, 50), (50, -1), (100, 50), (50, 100)]:
+        assert superchamber.chamber_at(*point) is superchamber.default_chamber
+
+
+def test_superchamber_grids_match_chamber_at(rng):
+    superchamber = generator.make_superchamber(
+        rng, 300, 200, [list("ABC"), list("D F")]
+    )
+    positions = rng.uniform(-50, 350, size=(200, 2))
+
+    cells = superchamber.cells_at(positions)
+
+    exp = [superchamber.chamber_at(*p) for p in positions]
+    np.testing.assert_array_equal(
+        superchamber.magnet_vectors[cells], [c._magnet_vector for c in exp]
+    )
+    np.testing.assert_array_equal(
+        superchamber.frictions[cells], [c.friction for c in exp]
+    )
+
+
 @pytest.mark.parametrize(
     "text, padding, expected_result",
     [
@@ -70,3 +96,20 @@ def test_superchamber_get_chamber_at(rng, dims, grid, point, exp_row_col):
 def test_layout_text(text, padding, expected_result):
     res = layout.layout_text(text, padding)
     assert res == expected_result
+
+
+def test_fixed_timestep_simulation_is_reproducible():
+    def run():
+        rng = np.random.default_rng(5)
+        chamber = generator.make_superchamber(rng, 200, 100, [list("AB")])
+        sim = Simulation(chamber, generator.generate_particles(rng, chamber), dt=0.01)
+        sim.start()
+        for _ in range(50):
+            sim.step()
+        return [p.position for p in sim.particles]
+
+    first = run()
+    second = run()
+
+    assert len(first) == len(second)
+    np.testing.assert_array_equal(first, second)
@@ -0,0 +1,56 @@
+import dataclasses
+
+import pytest
+
+from genart import color
+from genart.color import Color, LinearGradient, PatternCache, RadialGradient
+
+
+@pytest.fixture
+def patterns():
+    color.PATTERNS.clear()
+    yield color.PATTERNS
+    color.PATTERNS.clear()
+
+
+def test_colors_are_frozen_and_hashable():
+    assert hash(Color(1, 0, 0)) == hash(Color(1.0, 0.0, 0.0, 1.0))
+    assert hash(RadialGradient([Color(1, 0, 0)])) == hash(
+        RadialGradient((Color(1, 0, 0),))
+    )
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        Color(1, 0, 0).r = 0.5
+
+
+def test_patterns_are_shared_between_equal_colors(patterns):
+    Color(1, 0, 0).to_pattern()
+    Color(1.0, 0.0, 0.0).to_pattern()
+    Color(0, 1, 0).to_pattern()
+
+    assert (patterns.misses, patterns.hits, len(patterns)) == (2, 1, 2)
+
+
+def test_gradient_patterns_are_not_cached(patterns):
+    stops = [Color(0, 0, 0), Color(1, 1, 1)]
+    RadialGradient(stops).to_pattern(10, 10, 5)
+    LinearGradient(stops).to_pattern(10, 10, 5, 5)
+
+    assert (patterns.misses, patterns.hits) == (0, 0)
+
+
+def test_least_recently_used_patterns_are_dropped():
+    cache = PatternCache(max_size=2)
+    made = []
+
+    def make(key):
+        return lambda: made.append(key) or key
+
+    cache.get("a", make("a"))
+    cache.get("b", make("b"))
+    cache.get("a", make("a"))
+    cache.get("c", make("c"))
+    cache.get("a", make("a"))
+    cache.get("b", make("b"))
+
+    assert made == ["a", "b", "c", "b"]
+    assert len(cache) == 2
@@ -47,3 +47,33 @@ def test_circle_from_3_points(
 
     np.testing.assert_array_equal(res_center, exp_center)
     assert res_radius == exp_radius
+
+
+def test_distances_broadcast():
+    points = np.array([[3.0, 4.0], [0.0, 1.0], [6.0, 8.0]])
+
+    np.testing.assert_array_equal(geom.distances(points, (0.0, 0.0)), [5.0, 1.0, 10.0])
+    assert geom.distances(points[:, None], points[None]).shape == (3, 3)
+
+
+def test_unit_vectors_match_unit_vector():
+    points = np.array([[3.0, 4.0], [0.0, -2.0]])
+
+    res = geom.unit_vectors(points, (0.0, 0.0))
+
+    np.testing.assert_allclose(res, [[0.6, 0.8], [0.0, -1.0]])
+    for point, exp in zip(points, res):
+        np.testing.assert_allclose(geom.unit_vector(tuple(point), (0.0, 0.0)), exp)
+
+
+def test_project_points_on_line():
+    points = np.array([[1.0, 5.0], [-2.0, 0.0], [3.0, 3.0]])
+
+    res = geom.project_points_on_line((0.0, 0.0), (2.0, 2.0), points)
+
+    np.testing.assert_allclose(res, [[3.0, 3.0], [-1.0, -1.0], [3.0, 3.0]])
+    for point, exp in zip(points, res):
+        # Plain tuples take the scalar path, arrays the vectorized one:
+        for p in (tuple(point), point):
+            proj = geom.projected_point_on_line((0.0, 0.0), (2.0, 2.0), p)
+            np.testing.assert_allclose(proj, exp)
@@ -0,0 +1,79 @@
+import argparse
+import importlib
+import logging
+import pkgutil
+import sys
+from pathlib import Path
+
+import pytest
+
+import genart
+from genart import color, main
+
+
+@pytest.mark.parametrize("name", list(main.SUBCOMMANDS))
+def test_subcommand_manifest_matches_module(name):
+    module, help = main.SUBCOMMANDS[name]
+    subparsers = argparse.ArgumentParser().add_subparsers()
+
+    importlib.import_module(module).register_parser(subparsers)
+
+    assert [(a.dest, a.help) for a in subparsers._choices_actions] == [(name, help)]
+
+
+def test_subcommand_manifest_is_complete():
+    modules = {module for module, _ in main.SUBCOMMANDS.values()}
+    pkgs = pkgutil.walk_packages([str(Path(genart.__file__).parent)], prefix="genart.")
+
+    for pkg in pkgs:
+        if pkg.ispkg and hasattr(importlib.import_module(pkg.name), "register_parser"):
+            assert pkg.name in modules
+
+
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        ([], None),
+        (["--version"], None),
+        (["wael", "--seed", "3"], "wael"),
+        (["-h", "technique", "circlepacking"], "technique"),
+        (["-v", "bubblechamber", "--tolerance", "0.5"], "bubblechamber"),
+    ],
+)
+def test_selected_subcommand(argv, expected):
+    assert main.selected_subcommand(argv) == expected
+
+
+def test_build_parser_parses_selected_subcommand():
+    args = main.build_parser(["selene", "--seed", "3"]).parse_args(
+        ["selene", "--seed", "3"]
+    )
+
+    assert args.subcommand == "selene"
+    assert args.seed == 3
+
+
+@pytest.mark.parametrize(
+    "argv, verbose", [(["selene"], False), (["-v", "selene"], True)]
+)
+def test_verbose_flag(argv, verbose):
+    assert main.build_parser(argv).parse_args(argv).verbose is verbose
+
+
+def test_main_reports_color_patterns(monkeypatch, caplog):
+    def draw(args, config):
+        color.Color(0.1, 0.2, 0.3).to_pattern()
+        color.Color(0.1, 0.2, 0.3).to_pattern()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-v", "--verbose", action="store_true")
+    parser.set_defaults(func=draw)
+    monkeypatch.setattr(main, "build_parser", lambda: parser)
+    monkeypatch.setattr(sys, "argv", ["genart", "-v"])
+
+    color.PATTERNS.clear()
+    with caplog.at_level(logging.INFO):
+        main.main()
+    color.PATTERNS.clear()
+
+    assert "Color patterns: 1 allocated, 1 reused (50.0%), 1 cached" in caplog.text
@@ -0,0 +1,76 @@
+import io
+import struct
+import sys
+import zlib
+
+import numpy as np
+import pytest
+
+from genart.png import PNG_SIGNATURE, PNGWriter, argb32_to_rgba
+
+
+def _chunks(data: bytes):
+    assert data.startswith(PNG_SIGNATURE)
+    pos = len(PNG_SIGNATURE)
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos : pos + 4])
+        kind = data[pos + 4 : pos + 8]
+        body = data[pos + 8 : pos + 8 + length]
+        (crc,) = struct.unpack(">I", data[pos + 8 + length : pos + 12 + length])
+        assert crc == zlib.crc32(kind + body)
+        yield kind, body
+        pos += 12 + length
+
+
+def _decode(data: bytes) -> np.ndarray:
+    chunks = list(_chunks(data))
+    width, height, depth, color_type = struct.unpack(">IIBB", chunks[0][1][:10])
+    assert (chunks[0][0], depth, color_type) == (b"IHDR", 8, 6)
+    assert chunks[-1] == (b"IEND", b"")
+
+    raw = zlib.decompress(b"".join(body for kind, body in chunks if kind == b"IDAT"))
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(height, 1 + width * 4)
+    assert (rows[:, 0] == 1).all()
+    # Undo the Sub filter:
+    return np.cumsum(rows[:, 1:].reshape(height, width, 4), axis=1, dtype=np.uint8)
+
+
+def test_png_round_trips_rows_written_in_bands():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (128, 96, 4), dtype=np.uint8)
+
+    f = io.BytesIO()
+    with PNGWriter(f, 96, 128, chunk_size=1024) as png:
+        png.write_rows(image[:50])
+        png.write_rows(image[50:])
+
+    assert len([kind for kind, _ in _chunks(f.getvalue()) if kind == b"IDAT"]) > 1
+    np.testing.assert_array_equal(_decode(f.getvalue()), image)
+
+
+def test_png_rejects_missing_or_extra_rows():
+    png = PNGWriter(io.BytesIO(), 2, 2)
+    with pytest.raises(ValueError):
+        png.write_rows(np.zeros((1, 3, 4), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        png.write_rows(np.zeros((3, 2, 4), dtype=np.uint8))
+
+    png.write_rows(np.zeros((1, 2, 4), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        png.close()
+
+
+@pytest.mark.parametrize("byteorder, fmt", [("little", "<I"), ("big", ">I")])
+def test_argb32_to_rgba_unpremultiplies_alpha(monkeypatch, byteorder, fmt):
+    # cairo stores each pixel as a 32-bit word in native byte order:
+    monkeypatch.setattr(sys, "byteorder", byteorder)
+    # Opaque red, half transparent premultiplied white, transparent, then padding:
+    pixels = [(255, 0, 0, 255), (128, 128, 128, 128), (0, 0, 0, 0)]
+    argb = [struct.pack(fmt, a << 24 | r << 16 | g << 8 | b) for r, g, b, a in pixels]
+    data = b"".join(argb) + bytes(4)
+
+    rgba = argb32_to_rgba(data, 3, 1, 16)
+
+    np.testing.assert_array_equal(
+        rgba, [[(255, 0, 0, 255), (255, 255, 255, 128), (0, 0, 0, 0)]]
+    )
@@ -0,0 +1,102 @@
+from itertools import cycle
+from math import cos, pi, sin
+
+import numpy as np
+import pytest
+
+from genart.geom import distance, projected_point_on_line, unit_vector
+from genart.jitter import jitter_array
+from genart.techniques.pointillism import Pattern, _linear_gradient_densities
+
+
+def _reference_density(at, start_grad, end_grad) -> float:
+    proj = projected_point_on_line(start_grad, end_grad, at)
+    # The direction of a projection onto the start itself is NaN, so not beyond it:
+    with np.errstate(invalid="ignore"):
+        beyond_grad_start = (
+            unit_vector(start_grad, end_grad) == unit_vector(start_grad, proj)
+        ).all()
+    if not beyond_grad_start:
+        return 1.0
+
+    pct_along_gcv = distance(start_grad, proj) / distance(start_grad, end_grad)
+    return 0.0 if pct_along_gcv > 1.0 else 1.0 - pct_along_gcv
+
+
+def _reference_dots(rng, start_bound, end_bound, start_grad, end_grad, dot_r, packed):
+    """The dots of the original per-dot loops"""
+    if packed:
+        colwidth = 2 * dot_r
+        rowheight = sin(pi / 3) * 2 * dot_r
+        staggers = cycle((0, cos(pi / 3) * 2 * dot_r))
+    else:
+        colwidth = rowheight = 2 * dot_r
+        staggers = cycle((0,))
+    rows = int((end_bound[1] - start_bound[1]) // rowheight)
+    cols = int((end_bound[0] - start_bound[0]) // colwidth)
+
+    dots = []
+    for row, stagger in zip(range(rows + 1), staggers):
+        cy = start_bound[1] + (row * rowheight)
+        density = _reference_density((0.0, cy), start_grad, end_grad)
+        for col in range(cols + 1):
+            if rng.random() > density:
+                continue
+            dots.append((start_bound[0] + (col * colwidth) + stagger, cy, dot_r))
+
+    return np.array(dots)
+
+
+# The reference compares unit vectors exactly, which only holds up along an axis:
+GRADIENTS = [((0, 0), (0, 60.0)), ((0, 10.0), (0, 90.0)), ((0, 70.0), (0, 20.0))]
+
+
+@pytest.mark.parametrize("start_grad, end_grad", GRADIENTS)
+@pytest.mark.parametrize("pattern", list(Pattern))
+def test_pattern_matches_reference_loop(pattern, start_grad, end_grad):
+    args = ((0.0, 0.0), (100.0, 80.0), start_grad, end_grad, 2.0)
+    packed = pattern in (Pattern.PACKED, Pattern.PACKED_JITTER)
+
+    expected = _reference_dots(np.random.default_rng(3), *args, packed)
+    dots = pattern.array_func(np.random.default_rng(3), *args)
+    generated = np.array(list(pattern.func(np.random.default_rng(3), *args)))
+
+    assert dots.shape == expected.shape
+    np.testing.assert_array_equal(generated, dots)
+    if pattern in (Pattern.ORTHO, Pattern.PACKED):
+        np.testing.assert_allclose(dots, expected)
+    else:
+        # Jitter is drawn after thinning, so the same dots are kept:
+        jitter = (2.0 / 3.0, 2.0 / 3.0, 2.0 / 5.0) if not packed else (0.5, 0.5, 0.4)
+        assert (np.abs(dots - expected) <= jitter).all()
+
+
+def test_oblique_gradient_densities():
+    rows = np.array([[0.0, -10.0], [0.0, 0.0], [0.0, 40.0], [0.0, 80.0]])
+
+    res = _linear_gradient_densities(rows, (10.0, -5.0), (30.0, 70.0))
+
+    # 1 before the start, then falling with the projection onto the gradient:
+    np.testing.assert_allclose(res, [1.0, 1.0 - 175 / 6025, 1.0 - 3175 / 6025, 0.0])
+
+
+def test_pattern_array_follows_gradient(rng):
+    dots = Pattern.ORTHO.array_func(
+        rng, (0.0, 0.0), (200.0, 100.0), (0, 0), (0, 50.0), 1.0
+    )
+
+    # Fully dense before the end of the gradient, empty beyond it:
+    assert ((dots[:, 1] == 0.0).sum()) == 101
+    assert (dots[:, 1] <= 50.0).all()
+    assert (dots[:, 2] == 1.0).all()
+
+
+def test_jitter_array(rng):
+    points = np.zeros((1000, 3))
+
+    res = jitter_array(points, rng, (1.0, 2.0))
+
+    assert (np.abs(res[:, 0]) <= 1.0).all()
+    assert (np.abs(res[:, 1]) <= 2.0).all()
+    assert (np.abs(res[:, 1]) > 1.0).any()
+    assert (res[:, 2] == 0.0).all()
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from genart import simplify
+from genart.simplify import Simplification
+
+
+def _spiral(n: int = 2000) -> np.ndarray:
+    t = np.linspace(0.0, 6 * np.pi, n)
+    return np.stack((t * np.cos(t), t * np.sin(t)), axis=-1) * 10.0
+
+
+def _bezier_points(start, controls, end, n: int = 200) -> np.ndarray:
+    u = np.linspace(0.0, 1.0, n)[:, np.newaxis]
+    c1, c2 = controls
+    return (
+        (1 - u) ** 3 * start
+        + 3 * (1 - u) ** 2 * u * c1
+        + 3 * (1 - u) * u**2 * c2
+        + u**3 * end
+    )
+
+
+def test_sampled_path_pairs_samples():
+    trail = np.arange(12.0).reshape(6, 2)
+
+    res = simplify.sampled_path(trail)
+
+    assert res.samples.tolist() == [0, 2, 4]
+    assert res.controls.tolist() == [[[2.0, 3.0], [2.0, 3.0]], [[6.0, 7.0], [6.0, 7.0]]]
+
+
+@pytest.mark.parametrize("n", [1, 2, 3])
+def test_short_trails(n: int):
+    trail = np.arange(2.0 * n).reshape(n, 2)
+
+    for simplification in Simplification:
+        res = simplify.simplify(trail, 0.5, simplification)
+
+        assert res.points[0].tolist() == [0.0, 1.0]
+        assert len(res) <= max(n - 1, 0)
+
+
+def test_douglas_peucker_drops_collinear_points():
+    points = np.array([[0.0, 0.0], [1.0, 1.0], [2.0, 2.0], [3.0, 0.0], [4.0, 0.05]])
+
+    res = simplify.douglas_peucker(points, 0.1)
+
+    assert res.tolist() == [0, 2, 3, 4]
+
+
+@pytest.mark.parametrize("tolerance", [0.1, 1.0])
+def test_douglas_peucker_stays_within_tolerance(tolerance: float):
+    points = _spiral()
+
+    res = simplify.douglas_peucker(points, tolerance)
+
+    assert len(res) < len(points) / 5
+    for start, end in zip(res[:-1], res[1:]):
+        dists = simplify._segment_distances(
+            points[start : end + 1], points[start], points[end]
+        )
+        assert dists.max() <= tolerance
+
+
+@pytest.mark.parametrize("tolerance", [0.1, 1.0])
+def test_fit_curves_stays_within_tolerance(tolerance: float):
+    points = _spiral()
+
+    samples, controls = simplify.fit_curves(points, tolerance)
+
+    assert samples[0] == 0 and samples[-1] == len(points) - 1
+    assert len(controls) == len(samples) - 1
+    assert len(controls) < len(simplify.douglas_peucker(points, tolerance))
+    for start, end, ctrl in zip(samples[:-1], samples[1:], controls):
+        curve = _bezier_points(points[start], ctrl, points[end])
+        dists = np.linalg.norm(
+            points[start : end + 1, np.newaxis] - curve[np.newaxis], axis=-1
+        )
+        # The curve is only sampled, so allow for the distance between its samples:
+        assert dists.min(axis=1).max() <= tolerance + 0.5
+
+
+def test_reduction_counts_segments():
+    res = simplify.Reduction()
+
+    res.add(100, 10)
+    res.add(100, 30)
+
+    assert (res.before, res.after) == (200, 40)
+    assert str(res) == "200 -> 40 segments (20.0%)"
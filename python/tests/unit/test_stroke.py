@@ -0,0 +1,79 @@
+import numpy as np
+
+from genart import stroke
+from genart.simplify import TrailPath, fit_curves
+
+
+def _constant(w: float):
+    return lambda samples: np.full(samples.shape, w)
+
+
+def _evaluate(cubics: np.ndarray, n: int = 50) -> np.ndarray:
+    return np.concatenate(
+        [
+            stroke._evaluate(np.repeat(c[np.newaxis], n, 0), np.linspace(0, 1, n))
+            for c in cubics
+        ]
+    )
+
+
+def test_straight_line_outline_is_a_rectangle():
+    path = TrailPath(np.array([[0.0, 0.0], [10.0, 0.0]]), np.array([0, 10]))
+
+    res = stroke.variable_width_outline(path, _constant(2.0), resolution=1)
+
+    assert res.shape == (4, 4, 2)
+    corners = res[:, 0].tolist()
+    assert corners == [[0.0, 1.0], [10.0, 1.0], [10.0, -1.0], [0.0, -1.0]]
+    # The outline is closed:
+    assert np.allclose(res[-1, -1], res[0, 0])
+    assert np.allclose(res[:-1, -1], res[1:, 0])
+
+
+def test_outline_follows_width_profile():
+    t = np.linspace(0.0, 4 * np.pi, 400)
+    trail = np.stack((t * np.cos(t), t * np.sin(t)), axis=-1) * 20.0
+    samples, controls = fit_curves(trail, 0.1)
+    path = TrailPath(trail[samples], samples, controls)
+
+    def width(samples: np.ndarray) -> np.ndarray:
+        return np.sin(samples / len(trail) * np.pi) * 4.0
+
+    res = stroke.variable_width_outline(path, width)
+
+    # Both offset curves stay about half the width away from the trail:
+    mid = len(trail) // 2
+    outline = _evaluate(res)
+    dists = np.linalg.norm(outline - trail[mid], axis=-1)
+    assert abs(dists.min() - 2.0) < 0.1
+    # And meet at its ends, where the width is zero:
+    assert np.allclose(res[0, 0], trail[0])
+    assert np.allclose(res[len(res) // 2 - 1, -1], trail[-1], atol=0.1)
+
+
+def test_split_keeps_curves():
+    trail = np.cumsum(np.ones((17, 2)), axis=0) ** 1.5
+    samples, controls = fit_curves(trail, 1.0)
+    path = TrailPath(trail[samples], samples, controls)
+
+    cubics, starts, ends = stroke._split(path, 2 * len(path))
+
+    # Each curve is halved:
+    assert len(cubics) == 2 * len(path)
+    assert np.allclose(starts[1:], ends[:-1])
+    assert np.allclose(ends[1::2], samples[1:])
+    assert np.allclose(cubics[1::2, -1], path.points[1:])
+    u = np.linspace(0.0, 1.0, 50)
+    first = np.repeat(path.cubics()[:1], 50, axis=0)
+    assert np.allclose(
+        stroke._evaluate(np.repeat(cubics[1:2], 50, axis=0), u),
+        stroke._evaluate(first, 0.5 + u / 2),
+    )
+
+
+def test_empty_path_has_no_outline():
+    path = TrailPath(np.array([[1.0, 1.0]]), np.array([0]))
+
+    res = stroke.variable_width_outline(path, _constant(1.0))
+
+    assert res.shape == (0, 4, 2)
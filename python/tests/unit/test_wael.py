@@ -0,0 +1,246 @@
+import numpy as np
+import pytest
+
+from genart.color import Color, RadialGradient
+from genart.wael import generator, models, sprites, tiles
+from genart.wael.sprites import EyeSprites
+
+
+class FakeSurface:
+    def __init__(self, size: int):
+        self.size = size
+
+    def get_width(self) -> int:
+        return self.size
+
+    def get_height(self) -> int:
+        return self.size
+
+    def get_stride(self) -> int:
+        return 4 * self.size
+
+
+@pytest.fixture
+def fake_render(monkeypatch):
+    rendered = []
+
+    def render(look):
+        rendered.append(look)
+        return FakeSurface(10)
+
+    monkeypatch.setattr(sprites, "_render", render)
+    return rendered
+
+
+def _eye(pos=(0.0, 0.0), size=10.0, pupil_size=3.0, rotation=0.0, iris=True):
+    pos = np.array(pos)
+    return models.Eye(
+        pos,
+        size,
+        Color(1.0, 1.0, 1.0),
+        models.SlitPupil(pos, pupil_size, 2.0),
+        models.Iris(pos, 6.0, RadialGradient([Color(0.2, 0.4, 0.6), Color(1, 0, 0)]))
+        if iris
+        else None,
+        models.Eyelids(pos, 12.0, 7.0, Color(0.9, 0.7, 0.6)),
+        rotation,
+    )
+
+
+def test_look_ignores_position_and_rotation():
+    cache = EyeSprites(quantum=0.25)
+
+    first = cache.look(_eye(pos=(10.0, 20.0), rotation=1.0))
+    second = cache.look(_eye(pos=(300.0, 5.0), rotation=2.0))
+
+    assert sprites._key(first) == sprites._key(second)
+    assert first.rotation == 0.0
+    assert first.pos.tolist() == first.pupil.pos.tolist() == [0.0, 0.0]
+
+
+def test_look_quantizes_dimensions():
+    cache = EyeSprites(quantum=0.25)
+
+    same = [cache.look(_eye(size=s)) for s in (10.0, 10.1)]
+    other = cache.look(_eye(size=10.2))
+
+    assert same[0].size == 10.0
+    assert sprites._key(same[0]) == sprites._key(same[1])
+    assert sprites._key(same[0]) != sprites._key(other)
+    assert sprites._key(cache.look(_eye(iris=False))) != sprites._key(same[0])
+
+
+def test_sprites_are_reused(fake_render):
+    cache = EyeSprites()
+
+    for pupil_size in (3.0, 3.0, 4.0, 3.0):
+        cache.sprite(_eye(pupil_size=pupil_size))
+
+    assert len(fake_render) == 2
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert cache.hit_rate == 0.5
+    assert cache.nbytes == 2 * 400
+
+
+def test_least_recently_used_sprites_are_dropped(fake_render):
+    cache = EyeSprites(max_bytes=2 * 400)
+
+    for pupil_size in (1.0, 2.0, 1.0, 3.0, 1.0, 2.0):
+        cache.sprite(_eye(pupil_size=pupil_size))
+
+    # 2.0 was dropped when 3.0 came in, 1.0 stayed in use:
+    assert [look.pupil.size for look in fake_render] == [1.0, 2.0, 3.0, 2.0]
+    assert len(cache) == 2
+    assert cache.nbytes == 2 * 400
+
+
+def test_bands_cover_the_canvas():
+    rows = list(tiles.bands(250, 120, 100))
+
+    assert rows == [
+        [(0, 0, 100, 100), (100, 0, 100, 100), (200, 0, 50, 100)],
+        [(0, 100, 100, 20), (100, 100, 100, 20), (200, 100, 50, 20)],
+    ]
+
+
+def test_scene_finds_the_eyes_touching_a_tile_in_order():
+    eyes = [_eye((50.0, 50.0)), _eye((95.0, 50.0)), _eye((300.0, 300.0))]
+    scene = tiles.Scene(models.Flesh(Color(1, 1, 1)), eyes, cell_size=25.0)
+
+    def found(*box):
+        return [eye.pos[0] for eye in scene.eyes_in(*box)]
+
+    assert found(0, 0, 100, 100) == [50.0, 95.0]
+    # Overlaps the next tile by its radius and the eyelid clip margin:
+    assert found(100, 0, 200, 100) == [95.0]
+    assert found(200, 200, 300, 300) == [300.0]
+
+
+class BufferSurface(FakeSurface):
+    def __init__(self, width: int, height: int):
+        super().__init__(width)
+        self.height = height
+        self.data = bytearray(height * self.get_stride())
+
+    def get_height(self) -> int:
+        return self.height
+
+    def get_data(self) -> bytearray:
+        return self.data
+
+    def flush(self):
+        pass
+
+    def mark_dirty(self):
+        pass
+
+
+class NumberedScene(tiles.Scene):
+    """Fills each pixel row with its y coordinate instead of drawing"""
+
+    def rows(self, tile):
+        _, y0, w, h = tile
+        return np.repeat(np.arange(y0, y0 + h, dtype=np.uint8), 4 * w).reshape(h, -1)
+
+
+def test_paint_assembles_bands_from_workers():
+    scene = NumberedScene(models.Flesh(Color(1, 1, 1)), [], cell_size=10.0)
+    surface = BufferSurface(3, 10)
+
+    tiles.paint(surface, scene, workers=2, band_height=3)
+
+    pixels = np.frombuffer(surface.data, dtype=np.uint8).reshape(10, 12)
+    np.testing.assert_array_equal(pixels, np.arange(10)[:, None].repeat(12, axis=1))
+
+
+def test_random_eyes_builds_eyes_from_arrays(rng):
+    positions = rng.uniform(0.0, 100.0, (500, 2))
+    sizes = rng.uniform(0.5, 30.0, 500)
+
+    eyes = generator.random_eyes(rng, positions, sizes)
+
+    assert len(eyes) == 500
+    for i, eye in enumerate(eyes):
+        np.testing.assert_array_equal(eye.pos, positions[i])
+        assert eye.size == sizes[i]
+        assert (eye.iris is not None) == eyes.has_iris[i]
+        assert (eye.eyelids is not None) == eyes.has_eyelids[i]
+        assert 0.0 < eye.pupil.size <= (eye.iris.size if eye.iris else eye.size)
+    with pytest.raises(IndexError):
+        eyes[500]
+
+
+def test_random_eyes_pupils_match_random_eye_on_small_eyes(rng):
+    # Round pupils of these eyes can be up to 1.6 to 3.2px, and at least 1px:
+    positions = np.zeros((2000, 2))
+    sizes = np.full(2000, 4.0)
+
+    def round_pupils(eyes):
+        return np.array(
+            [e.pupil.size for e in eyes if type(e.pupil) is models.Pupil], dtype=float
+        )
+
+    one_by_one = round_pupils(
+        generator.random_eye(rng, pos, size) for pos, size in zip(positions, sizes)
+    )
+    at_once = round_pupils(generator.random_eyes(rng, positions, sizes))
+
+    assert one_by_one.min() >= 1.0
+    assert at_once.min() >= 1.0
+    assert at_once.mean() == pytest.approx(one_by_one.mean(), abs=0.03)
+
+
+def _pixels(surface) -> np.ndarray:
+    surface.flush()
+    return np.frombuffer(surface.get_data(), dtype=np.uint8).copy()
+
+
+def test_paint_in_parallel_matches_drawing_directly(real_cairo):
+    rng = np.random.default_rng(3)
+    positions = rng.uniform(0.0, 120.0, (40, 2))
+    eyes = list(generator.random_eyes(rng, positions, rng.uniform(5.0, 15.0, 40)))
+    flesh = models.Flesh(Color(0.8, 0.5, 0.4))
+
+    serial = real_cairo.ImageSurface(real_cairo.Format.ARGB32, 120, 90)
+    ctx = real_cairo.Context(serial)
+    flesh.draw(ctx)
+    for eye in eyes:
+        eye.draw(ctx)
+
+    parallel = real_cairo.ImageSurface(real_cairo.Format.ARGB32, 120, 90)
+    tiles.paint(parallel, tiles.Scene(flesh, eyes, 10.0), workers=2, band_height=17)
+
+    np.testing.assert_array_equal(_pixels(parallel), _pixels(serial))
+
+
+@pytest.mark.parametrize("iris", [False, True])
+def test_sprite_looks_like_the_eye_drawn_directly(real_cairo, iris):
+    eye = _eye(pos=(40.3, 35.7), size=20.1, pupil_size=6.2, rotation=0.7, iris=iris)
+
+    def drawn(draw):
+        surface = real_cairo.ImageSurface(real_cairo.Format.ARGB32, 80, 80)
+        ctx = real_cairo.Context(surface)
+        models.Flesh(Color(0.8, 0.5, 0.4)).draw(ctx)
+        draw(ctx)
+        return _pixels(surface).reshape(80, 80, 4).astype(int)
+
+    direct = drawn(eye.draw)
+    blitted = drawn(lambda ctx: EyeSprites().draw(ctx, eye))
+
+    # Only antialiased edges and the resampling of the sprite differ:
+    diff = np.abs(direct - blitted).max(axis=-1)
+    assert diff.mean() < 4.0
+    assert (diff > 64).mean() < 0.02
+
+
+def test_scene_draws_from_an_empty_sprite_cache(monkeypatch):
+    blitted = []
+    monkeypatch.setattr(EyeSprites, "draw", lambda self, ctx, eye: blitted.append(eye))
+    scene = tiles.Scene(
+        models.Flesh(Color(1, 1, 1)), [_eye((10.0, 10.0))], 10.0, EyeSprites()
+    )
+
+    scene.draw((0, 0, 20, 20))
+
+    # An empty cache is falsy, but must still be used:
+    assert len(blitted) == 1